@@ -4,12 +4,21 @@ import os
 import numpy
 import h5py
 import datetime
+import threading
+import time
 import silx.gui.qt as qt
-from typing import Callable, Any
+
+# Longest time written frames may sit in HDF5's buffers before the file is flushed
+RECORDING_FLUSH_INTERVAL_S = 0.25
+
+# Upper bound on grabs used to drain stale frames from the driver buffer
+MAX_DRAIN_GRABS = 5
 
 class CameraInit:
     """Class for capturing frames from a camera. Supports live display and optional HDF5 recording."""
     def __init__(self, initial_size, port=1, backend=cv2.CAP_ANY, name="Camera Placeholder", fps=1.0):
+        # Cached cap.isOpened() state, so per-frame checks avoid a call into OpenCV
+        self.is_open = False
         try:
             self.frame_index = 0
             self.fps = float(fps)
@@ -19,9 +28,11 @@ class CameraInit:
             self.camera_port = port
             self.camera_backend = backend
             self.camera_name = name
-            self.on_resize: Callable[[Any], None] | None = None
             self.h5_file = None  # HDF5 file handle
             self.is_recording = False  # Recording state
+            self._last_flush = 0.0  # perf_counter() time of the last recording file flush
+            # Guards recording state shared between the capture thread and the GUI
+            self._lock = threading.Lock()
             
             # Callback for resizing the dataset
             self.cache_folder = "cacheimg"
@@ -38,6 +49,7 @@ class CameraInit:
             "Check the Camera connection"+
                                     " menu for more information.")
                 return
+            self.is_open = True
 
             # Initialize single-frame buffer for live display (no HDF5 yet)
             gray_frame = self._capture_frame_raw()
@@ -55,35 +67,51 @@ class CameraInit:
             qt.QMessageBox.critical(None, "Camera Initialization Error", f"An error occurred during camera initialization: {str(e)}")
 
     def capture_frame(self):
-        """ Capture a frame from the camera. Store in HDF5 if recording, otherwise in circular buffer. """
+        """ Capture a frame from the camera. Store in HDF5 if recording, otherwise in circular buffer.
+        Returns the captured grayscale frame, or None if the capture failed. """
         nfr = self._capture_frame_raw()
         if nfr is None:
             return None
         
-        if self.is_recording and self.image_dataset is not None:
-            # Store in HDF5 dataset
-            if self.frame_index >= self.dataset_size:
-                new_size = int(self.dataset_size + 500)
-                print(f"Resizing dataset from {self.dataset_size} to {new_size} frames...")
-                self.image_dataset.resize(new_size, axis=0)
-                self.dataset_size = new_size
-                if self.on_resize is not None:
-                    self.on_resize(self.image_dataset)
-            self.image_dataset[self.frame_index] = nfr
-            self.frame_index += 1
-        else:
-            # Store only the latest frame for live display
-            print("Storing latest frame for live display")
-            print(nfr)
-            if self.latest_frame is not None:
-                self.latest_frame[0] = nfr
+        with self._lock:
+            if self.is_recording and self.image_dataset is not None:
+                self._write_frame(nfr)
+            else:
+                # Store only the latest frame for live display
+                if self.latest_frame is not None:
+                    self.latest_frame[0] = nfr
+        return nfr
+
+    def _write_frame(self, frame):
+        """ Write one frame to the HDF5 dataset. Must be called with the lock held.
+        frame_index counts the frames written, i.e. the frames readable from the dataset.
+        Each frame fills exactly one (1, H, W) chunk, so no chunk is read back or rewritten. """
+        if self.frame_index >= self.dataset_size:
+            new_size = int(self.dataset_size + 500)
+            print(f"Resizing dataset from {self.dataset_size} to {new_size} frames...")
+            self.image_dataset.resize(new_size, axis=0)
+            self.dataset_size = new_size
+            # No GUI callback here: this runs on the capture thread, and the GUI
+            # picks up the grown dataset in its own recording refresh
+        self.image_dataset[self.frame_index] = frame
+        self.frame_index += 1
+        # Bound what a crash can lose without flushing on every frame
+        now = time.perf_counter()
+        if now - self._last_flush >= RECORDING_FLUSH_INTERVAL_S:
+            self.h5_file.flush()
+            self._last_flush = now
 
     def _capture_frame_raw(self):
         """ Capture a raw frame from the camera and return it as a numpy array. """
-        # Flush all buffered frames by grabbing until we get the latest one
-        for _ in range(10):  # Flush up to 10 buffered frames
-            grabbed = self.cap.grab()
-            if not grabbed:
+        # Drain stale buffered frames without decoding them. A buffered frame is
+        # returned at once; a grab that had to wait for the sensor delivered a
+        # fresh frame, so stop there instead of blocking for further frames.
+        fresh_wait = 0.5 / self.fps if self.fps > 0 else 0.0
+        for _ in range(MAX_DRAIN_GRABS):
+            start = time.perf_counter()
+            if not self.cap.grab():
+                break
+            if time.perf_counter() - start >= fresh_wait:
                 break
         
         ret, frame = self.cap.retrieve()
@@ -114,18 +142,23 @@ class CameraInit:
         if file_path is None:
             file_path = os.path.join(self.cache_folder, f"dataset_{datetime.datetime.now().strftime('%d-%m-%Y_%H-%M-%S')}.h5")
         
-        self.h5_file = h5py.File(file_path, "w")
-        self.image_dataset = self.h5_file.create_dataset(
-            "arrays",
-            shape=(self.dataset_size, height, width),
-            maxshape=(None, height, width),
-            dtype=numpy.float32,
-            chunks=(10, height, width),
-            compression='gzip',
-        )
-        self.is_recording = True
-        self.frame_index = 0
-        self.recording_file_path = file_path
+        with self._lock:
+            self.h5_file = h5py.File(file_path, "w")
+            self.image_dataset = self.h5_file.create_dataset(
+                "arrays",
+                shape=(self.dataset_size, height, width),
+                maxshape=(None, height, width),
+                dtype=numpy.float32,
+                # One frame per chunk: browsing a recording reads exactly one chunk per frame
+                chunks=(1, height, width),
+                # Uncompressed: gzip holds the GIL and cannot keep up with live capture
+                compression=None,
+                shuffle=False,
+            )
+            self._last_flush = time.perf_counter()
+            self.is_recording = True
+            self.frame_index = 0
+            self.recording_file_path = file_path
         print(f"Started HDF5 recording to {self.h5_file.filename}")
 
     def stop_recording(self):
@@ -133,17 +166,18 @@ class CameraInit:
         if not self.is_recording:
             return None
         
-        self.is_recording = False
-        file_path = getattr(self, 'recording_file_path', None)
-        if self.h5_file is not None:
-            # Trim dataset to actual recorded frames
-            if self.image_dataset is not None and self.frame_index < self.dataset_size:
-                self.image_dataset.resize(self.frame_index, axis=0)
-            self.h5_file.close()
-            self.h5_file = None
-        self.image_dataset = None
-        recorded_frames = self.frame_index
-        self.frame_index = 0
+        with self._lock:
+            self.is_recording = False
+            file_path = getattr(self, 'recording_file_path', None)
+            if self.h5_file is not None:
+                # Trim dataset to actual recorded frames
+                if self.image_dataset is not None and self.frame_index < self.dataset_size:
+                    self.image_dataset.resize(self.frame_index, axis=0)
+                self.h5_file.close()
+                self.h5_file = None
+            self.image_dataset = None
+            recorded_frames = self.frame_index
+            self.frame_index = 0
         print(f"Stopped HDF5 recording. Recorded {recorded_frames} frames to {file_path}")
         return file_path
     
@@ -152,6 +186,7 @@ class CameraInit:
         return os.path.join(self.cache_folder, f"dataset_{datetime.datetime.now().strftime('%d-%m-%Y_%H-%M-%S')}.h5")
 
     def cleanup(self):
+        self.is_open = False
         self.cap.release()
         if self.h5_file is not None:
             self.h5_file.close()
@@ -178,3 +213,53 @@ class CameraInit:
         """ Opens the DirectShow settings dialog for the camera (Windows only). """
         if os.name == 'nt':  # Check if the OS is Windows
             self.cap.set(cv2.CAP_PROP_SETTINGS, 1)
+
+
+class CaptureWorker(qt.QThread):
+    """Background thread that captures camera frames and hands them to the GUI."""
+    frameReady = qt.Signal(object)  # captured 2D grayscale frame
+
+    def __init__(self, camera):
+        super().__init__()
+        self.camera = camera
+        self._running = False
+
+    def stop(self):
+        """Stop the capture loop and wait for the thread to finish."""
+        self._running = False
+        self.wait()
+
+    def _frame_period(self):
+        """Return the capture period (s) for the camera's current FPS setting."""
+        try:
+            fps = float(self.camera.getFPS())
+        except Exception:
+            fps = 1.0
+        return 1.0 / fps if fps > 0 else 1.0
+
+    def run(self):
+        """Capture frames at the camera FPS and emit each one as it arrives.
+
+        The loop ends once the camera is closed, and picks up FPS changes
+        on the next frame.
+        """
+        self._running = True
+        next_tick = time.perf_counter()
+
+        while self._running:
+            # Camera was released (cleanup) - nothing left to capture
+            if not self.camera.is_open:
+                break
+
+            frame = self.camera.capture_frame()
+            if frame is not None:
+                self.frameReady.emit(frame)
+
+            # Pace against an absolute schedule so the rate does not drift
+            next_tick += self._frame_period()
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind by more than a frame - restart the schedule from now
+                next_tick = time.perf_counter()
@@ -4,6 +4,9 @@ import cv2.videoio_registry as cv2_reg
 import camera.opencv_capture as cap
 import cv2_enumerate_cameras as cv2_enum
 
+# Delay before re-enumerating cameras after the backend selection changes
+BACKEND_CHANGE_DELAY_MS = 150
+
 class CameraConnectWindow(qt.QMainWindow):
     """Window for setting up and launching the camera."""
     backendValuePicked = qt.Signal(int, int, str, float) # port, backend, name, fps
@@ -28,7 +31,13 @@ class CameraConnectWindow(qt.QMainWindow):
         for backend in cv2_enum.supported_backends:
             self.backend_combo.addItem(cv2_reg.getBackendName(backend))
         self.hlayout.addWidget(self.backend_combo)
-        self.backend_combo.currentIndexChanged.connect(self._refresh_camera_list)
+        # Probing cameras is slow (DirectShow in particular), so stepping through
+        # backends with the arrow keys only enumerates the one finally selected
+        self._backend_timer = qt.QTimer(self)
+        self._backend_timer.setSingleShot(True)
+        self._backend_timer.setInterval(BACKEND_CHANGE_DELAY_MS)
+        self._backend_timer.timeout.connect(self._refresh_camera_list)
+        self.backend_combo.currentIndexChanged.connect(lambda _index: self._backend_timer.start())
 
         self.h2layout = qt.QHBoxLayout()
         self.vlayout.addLayout(self.h2layout)
@@ -76,6 +85,7 @@ class CameraConnectWindow(qt.QMainWindow):
         self.close()
 
     def _refresh_camera_list(self):
+        self._backend_timer.stop()
         self.list_widget.clear()
         camera_ports = cv2_enum.enumerate_cameras(cv2_enum.supported_backends[self.backend_combo.currentIndex()])
         for camera in camera_ports:
@@ -5,6 +5,13 @@ import h5py
 import numpy as np
 import os
 import time
+import hashlib
+
+# Raw-data chunk cache for playback files: large enough to keep many
+# decompressed frame chunks resident while scrubbing with the slider
+PLAYBACK_RDCC_NBYTES = 256 * 1024 * 1024
+PLAYBACK_RDCC_NSLOTS = 10007  # prime, well above the number of cached chunks
+PLAYBACK_RDCC_W0 = 0.75
 
 def get_cache_dir():
     """Return path to cacheimg folder under current working directory and ensure it exists."""
@@ -119,18 +126,18 @@ class VideoConversionWorker(qt.QThread):
 
 
 class ConversionProgressDialog(qt.QDialog):
-    """Progress dialog for video conversion with cancel support."""
+    """Progress dialog for a frame-by-frame conversion worker with cancel support."""
     
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, title="Converting Video", text="Converting video to HDF5 format..."):
         super().__init__(parent)
-        self.setWindowTitle("Converting Video")
+        self.setWindowTitle(title)
         self.setModal(True)
         self.setMinimumWidth(400)
         self.setWindowFlags(self.windowFlags() & ~qt.Qt.WindowContextHelpButtonHint)
         
         layout = qt.QVBoxLayout(self)
         
-        self.label = qt.QLabel("Converting video to HDF5 format...")
+        self.label = qt.QLabel(text)
         layout.addWidget(self.label)
         
         self.progressBar = qt.QProgressBar()
@@ -155,11 +162,15 @@ class ConversionProgressDialog(qt.QDialog):
     
     def start_conversion(self, video_path, h5_path, total_frames):
         """Start the background conversion."""
+        self.start_worker(VideoConversionWorker(video_path, h5_path, total_frames), total_frames)
+    
+    def start_worker(self, worker, total_frames):
+        """Start a worker with progress/finished/error signals and a cancel() method."""
         self.progressBar.setMaximum(total_frames if total_frames > 0 else 0)
         self.frameLabel.setText(f"Frame 0 / {total_frames}")
         self._start_time = time.time()
         
-        self.worker = VideoConversionWorker(video_path, h5_path, total_frames)
+        self.worker = worker
         self.worker.progress.connect(self._on_progress)
         self.worker.finished.connect(self._on_finished)
         self.worker.error.connect(self._on_error)
@@ -229,6 +240,63 @@ class ConversionProgressDialog(qt.QDialog):
         super().closeEvent(event)
 
 
+class RechunkWorker(qt.QThread):
+    """Background worker copying a 3D dataset into a file with one frame per chunk."""
+    progress = qt.Signal(int, int)  # frames copied, total_frames
+    finished = qt.Signal(str)  # result path
+    error = qt.Signal(str)  # error message
+    
+    def __init__(self, source_path, dataset_name, out_path, source_stamp):
+        super().__init__()
+        self.source_path = source_path
+        self.dataset_name = dataset_name
+        self.out_path = out_path
+        self.source_stamp = source_stamp
+        self._cancelled = False
+    
+    def cancel(self):
+        self._cancelled = True
+    
+    def run(self):
+        # Copy into a temporary file, so an interrupted copy never looks complete
+        tmp_path = self.out_path + '.tmp'
+        try:
+            with h5py.File(self.source_path, 'r') as src, h5py.File(tmp_path, 'w') as dst:
+                d = src[self.dataset_name]
+                N, H, W = d.shape
+                # Whole source chunks along the frame axis: each is decompressed once
+                step = d.chunks[0] if d.chunks is not None else 1
+                out = dst.create_dataset(
+                    'video_frames',
+                    shape=(N, H, W),
+                    chunks=(1, H, W),
+                    dtype=d.dtype,
+                    compression='lzf'
+                )
+                for start in range(0, N, step):
+                    if self._cancelled:
+                        break
+                    stop = min(start + step, N)
+                    out[start:stop] = d[start:stop]
+                    self.progress.emit(stop, N)
+                dst.attrs.update(self.source_stamp)
+            
+            if self._cancelled:
+                os.remove(tmp_path)
+                self.error.emit("Rechunking cancelled")
+                return
+            
+            os.replace(tmp_path, self.out_path)
+            self.finished.emit(self.out_path)
+        
+        except Exception as e:
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
+            self.error.emit(str(e))
+
+
 def get_video_frame_count(video_path):
     """Get the total frame count from a video file using metadata."""
     try:
@@ -251,6 +319,7 @@ class H5Playback:
     def __init__(self, file_path, file_type):
 
         self.h5_file = None
+        self.source_path = None
         self.image_dataset = None
         self.cancelled = False  # True if user cancelled conversion
 
@@ -265,7 +334,9 @@ class H5Playback:
             qt.QMessageBox.critical(None, "Error", "Unsupported file type.")
             return
 
-        self.h5_file = h5py.File(file_path, "r")
+        self.h5_file = self._open_h5(file_path)
+        # File that ROIs are loaded from and embedded into
+        self.source_path = os.path.abspath(file_path)
 
         # Try to find a 3D dataset (image stack, video)
         chosen_name = None
@@ -273,6 +344,23 @@ class H5Playback:
             d = self.h5_file[name]
             if isinstance(d, h5py.Dataset) and (d.ndim == 3 or d.ndim == 4):
                 if d.ndim == 3:
+                    if frames_split_across_chunks(d) and _confirm_rechunk(name, d):
+                        # Rewrite with one frame per chunk in cache and reopen;
+                        # source_path keeps pointing at the user's file for ROIs
+                        try:
+                            new_path = rechunk_h5_3d(file_path, name)
+                        except Exception as e:
+                            qt.QMessageBox.warning(None, "Warning", f"Failed to rechunk dataset, using it as is: {e}")
+                            new_path = None
+                        if new_path is not None:
+                            try:
+                                self.h5_file.close()
+                            except Exception:
+                                pass
+                            self.h5_file = self._open_h5(new_path)
+                            self.image_dataset = self.h5_file['video_frames']
+                            chosen_name = 'video_frames'
+                            break
                     self.image_dataset = d
                     chosen_name = name
                     break
@@ -284,7 +372,8 @@ class H5Playback:
                             self.h5_file.close()
                         except Exception:
                             pass
-                        self.h5_file = h5py.File(new_path, "r")
+                        self.h5_file = self._open_h5(new_path)
+                        self.source_path = new_path
                         self.image_dataset = self.h5_file['video_frames']
                         chosen_name = 'video_frames'
                         break
@@ -300,12 +389,49 @@ class H5Playback:
         self.dataset_size = self.image_dataset.shape[0]
         self.on_resize = None  # for compatibility
 
+        # Contiguous, unfiltered datasets can be read straight from the page cache
+        self.frames_memmap = self._memmap_dataset(self.image_dataset)
+
+    @staticmethod
+    def _open_h5(file_path):
+        """Open an H5 file read-only with an enlarged chunk cache for playback."""
+        return h5py.File(file_path, "r",
+                         rdcc_nbytes=PLAYBACK_RDCC_NBYTES,
+                         rdcc_nslots=PLAYBACK_RDCC_NSLOTS,
+                         rdcc_w0=PLAYBACK_RDCC_W0)
+
+    @staticmethod
+    def _memmap_dataset(dataset):
+        """Return a read-only np.memmap over a contiguous, uncompressed dataset, or None."""
+        try:
+            if dataset.chunks is not None or dataset.compression is not None or dataset.external:
+                return None
+            offset = dataset.id.get_offset()
+            if offset is None:
+                return None  # storage not allocated yet
+            return np.memmap(dataset.file.filename, dtype=dataset.dtype, mode='r',
+                             offset=offset, shape=dataset.shape)
+        except Exception as e:
+            print(f"Memory mapping not available, reading through h5py: {e}")
+            return None
+
+    def read_frame(self, index):
+        """Return one frame, from the memory map when available.
+
+        Memory-mapped frames are copied out so no view keeps the mapping alive
+        after close().
+        """
+        if self.frames_memmap is not None:
+            return np.array(self.frames_memmap[index])
+        return self.image_dataset[index]
+
     def capture_frame(self):
-        frame = self.image_dataset[self.frame_index]
+        frame = self.read_frame(self.frame_index)
         return frame
     
     def close(self):
         """Close the H5 file if open."""
+        self.frames_memmap = None
         if self.h5_file is not None:
             self.h5_file.close()
             self.h5_file = None
@@ -436,4 +562,112 @@ def convert_h5_4d_to_3d(input_h5_path, dataset_name):
                 out.resize((i + 1, H, W))
                 out[i] = gray
 
-    return out_path
\ No newline at end of file
+    return out_path
+
+def frames_split_across_chunks(dataset):
+    """Return True if a chunked 3D dataset does not store exactly one frame per chunk.
+
+    Frames split over several chunks, or several frames bundled per chunk (such as
+    older (10, H, W) recordings), make reading a single frame slow.
+    """
+    chunks = dataset.chunks
+    if chunks is None:
+        return False  # contiguous: a frame is one contiguous read
+    return chunks[0] != 1 or tuple(chunks[1:]) != tuple(dataset.shape[1:])
+
+def _confirm_rechunk(name, dataset):
+    """Ask whether a badly chunked dataset should be rewritten for frame browsing."""
+    answer = qt.QMessageBox.question(
+        None,
+        "Rechunk dataset",
+        f"Dataset '{name}' is stored in chunks of {dataset.chunks}, so reading a frame "
+        "decompresses more than that frame and browsing will be slow.\n\n"
+        "Rewrite a copy with one frame per chunk in the cache folder?",
+        qt.QMessageBox.Yes | qt.QMessageBox.No,
+        qt.QMessageBox.Yes,
+    )
+    return answer == qt.QMessageBox.Yes
+
+def _rechunk_cache_path(source_path):
+    """Return the cache path of the rechunked copy of an HDF5 file."""
+    base_name = os.path.splitext(os.path.basename(source_path))[0]
+    # Files with the same name in different folders get different cache entries
+    path_hash = hashlib.sha1(source_path.encode('utf-8')).hexdigest()[:8]
+    return os.path.join(get_cache_dir(), f'{base_name}_{path_hash}_rechunked.h5')
+
+def _source_stamp(source_path, dataset_name):
+    """Return the attributes identifying the source a rechunked copy was made from."""
+    stat = os.stat(source_path)
+    return {
+        'source_path': source_path,
+        'source_dataset': dataset_name,
+        'source_mtime_ns': stat.st_mtime_ns,
+        'source_size': stat.st_size,
+    }
+
+def rechunk_h5_3d(input_h5_path, dataset_name, parent=None):
+    """Copy a 3D HDF5 dataset into a new file with one frame per chunk.
+
+    Writes to cacheimg/<basename>_<path hash>_rechunked.h5 on a background worker
+    while a progress dialog is shown. A cached copy is reused only if it matches
+    the source's shape, dtype, mtime and size. Returns None if the copy was
+    cancelled or failed.
+    """
+    source_path = os.path.abspath(input_h5_path)
+    out_path = _rechunk_cache_path(source_path)
+    source_stamp = _source_stamp(source_path, dataset_name)
+
+    with h5py.File(source_path, 'r') as src:
+        d = src[dataset_name]
+        if d.ndim != 3:
+            raise ValueError('rechunk_h5_3d expects a 3D dataset')
+        shape, dtype = d.shape, d.dtype
+
+    # If already rechunked from this very source, reuse
+    if os.path.exists(out_path):
+        try:
+            with h5py.File(out_path, 'r') as fh:
+                cached = fh.get('video_frames')
+                if (isinstance(cached, h5py.Dataset) and cached.shape == shape
+                        and cached.dtype == dtype
+                        and all(fh.attrs.get(key) == value for key, value in source_stamp.items())):
+                    return out_path
+        except Exception:
+            pass
+        try:
+            os.remove(out_path)
+        except Exception:
+            pass
+
+    dialog = ConversionProgressDialog(parent, title="Rechunking Dataset",
+                                      text="Rewriting dataset with one frame per chunk...")
+    dialog.start_worker(RechunkWorker(source_path, dataset_name, out_path, source_stamp), shape[0])
+    
+    result = dialog.exec()
+    
+    # Wait for worker to fully terminate before the file is opened
+    dialog.wait_for_worker()
+    
+    if result == qt.QDialog.Accepted and dialog.result_path:
+        return dialog.result_path
+    return None
+
+def refresh_rechunk_stamp(source_path):
+    """Record the current mtime and size of a source in its rechunked copy.
+
+    Call after the application itself wrote non-frame data (ROIs) into the source,
+    so the rechunked copy stays valid. Does nothing if there is no copy of this source.
+    """
+    source_path = os.path.abspath(source_path)
+    out_path = _rechunk_cache_path(source_path)
+    if not os.path.exists(out_path):
+        return
+    try:
+        with h5py.File(out_path, 'r+') as fh:
+            if fh.attrs.get('source_path') != source_path:
+                return
+            stamp = _source_stamp(source_path, fh.attrs.get('source_dataset'))
+            fh.attrs['source_mtime_ns'] = stamp['source_mtime_ns']
+            fh.attrs['source_size'] = stamp['source_size']
+    except Exception as e:
+        print(f"Could not update rechunked copy of {source_path}: {e}")
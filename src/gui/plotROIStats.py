@@ -1,19 +1,167 @@
 import os
+import functools
+import threading
+from collections import OrderedDict
+import numpy as np
+import h5py
 from silx.gui import qt
 from silx.gui.plot import Plot2D
 from silx.gui.plot.StackView import StackView
 from silx.gui.colors import Colormap
 import time
-from camera.opencv_capture import CameraInit
 from gui.roiwidget import roiManagerWidget
 from gui.statswindow import roiStatsWindow
 from gui.about_dialog import AboutWindow
-from gui.camera_connect_dialog import CameraConnectWindow
-from gui.camera_settings_dialog import CameraSettingsWindow
-import gui.file_dialog as file_dialog
-from gui.file_dialog import H5Playback
 import gui.roidictionary as roidict
 
+# Datasets up to this size are read into memory in one bulk read on open.
+# The read runs on the GUI thread, so keep it to a fraction of a second, and
+# never take more than IN_MEMORY_STACK_RAM_FRACTION of the available memory
+IN_MEMORY_STACK_BYTES = 256 * 1024 * 1024
+IN_MEMORY_STACK_RAM_FRACTION = 0.25
+
+# While recording (and not syncing), the frame browser range is extended about
+# this many times per second, and never for fewer than RECORDING_RANGE_STEP frames
+RANGE_UPDATES_PER_SECOND = 4
+RECORDING_RANGE_STEP = 5
+
+# Quiet time after the last frame change before stats are recomputed
+FRAME_DEBOUNCE_MS = 15
+
+# Legend of the plot item showing live camera frames
+LIVE_IMAGE_LEGEND = "live"
+
+# Number of recently read frames kept for h5py-backed stacks
+FRAME_CACHE_SIZE = 16
+
+# Frame offsets read ahead into the frame cache after each frame change
+PREFETCH_OFFSETS = (1, 2, -1)
+
+def _in_memory_stack_budget():
+    """Return the largest dataset size (bytes) that is read into memory on open."""
+    try:
+        available = os.sysconf('SC_AVPHYS_PAGES') * os.sysconf('SC_PAGE_SIZE')
+    except (AttributeError, ValueError, OSError):
+        # os.sysconf is POSIX only; fall back to the fixed cap
+        return IN_MEMORY_STACK_BYTES
+    return min(IN_MEMORY_STACK_BYTES, int(available * IN_MEMORY_STACK_RAM_FRACTION))
+
+@functools.lru_cache(maxsize=32)
+def _std_icon(pixmap):
+    """Return the application style's standard icon for a pixmap, cached per pixmap."""
+    app = qt.QApplication.instance()
+    if app is None or app.style() is None:
+        return qt.QIcon()
+    return app.style().standardIcon(pixmap)
+
+
+class FrameCache:
+    """Small thread-safe LRU cache of frames read from an h5py-backed stack.
+
+    In-memory stacks are indexed directly; h5py datasets are sliced one frame at a
+    time and the most recent frames are kept so slider scrubbing stays in RAM.
+    The cache is emptied whenever it is asked for frames of a different stack.
+    """
+
+    def __init__(self, maxsize=FRAME_CACHE_SIZE):
+        self._maxsize = maxsize
+        self._frames = OrderedDict()
+        self._stack = None
+        self._reader = None
+        self._lock = threading.Lock()
+
+    def set_source(self, stack, reader=None):
+        """Start caching frames of `stack`, optionally read with `reader(index)` on a miss."""
+        with self._lock:
+            self._frames.clear()
+            self._stack = stack
+            self._reader = reader
+
+    def get(self, stack, frame_index):
+        """Return frame `frame_index` of `stack`, reading it on a cache miss."""
+        if not isinstance(stack, h5py.Dataset):
+            return stack[frame_index]
+
+        with self._lock:
+            if stack is not self._stack:
+                self._frames.clear()
+                self._stack = stack
+                self._reader = None
+            frame = self._frames.get(frame_index)
+            if frame is not None:
+                self._frames.move_to_end(frame_index)
+                return frame
+            reader = self._reader
+
+        # Read outside the lock - h5py serializes access itself
+        frame = reader(frame_index) if reader is not None else stack[frame_index, :, :]
+        with self._lock:
+            if stack is self._stack:
+                self._frames[frame_index] = frame
+                while len(self._frames) > self._maxsize:
+                    self._frames.popitem(last=False)
+        return frame
+
+    def prefetch(self, stack, frame_index):
+        """Read a frame into the cache if it is not there yet (h5py stacks only)."""
+        if not isinstance(stack, h5py.Dataset):
+            return
+        with self._lock:
+            if stack is self._stack and frame_index in self._frames:
+                return
+        self.get(stack, frame_index)
+
+    def clear(self):
+        """Drop all cached frames and the stack reference."""
+        with self._lock:
+            self._frames.clear()
+            self._stack = None
+            self._reader = None
+
+
+class FrameReadWorker(qt.QRunnable):
+    """Worker reading one frame of a stack in a thread pool."""
+
+    class Signals(qt.QObject):
+        """Signals for the worker (QRunnable can't have signals directly)."""
+        frameRead = qt.Signal(int, object)  # frame_index, frame_data
+
+    def __init__(self, stack, frame_index, cache):
+        super().__init__()
+        self.stack = stack
+        self.frame_index = frame_index
+        self.cache = cache
+        self.signals = FrameReadWorker.Signals()
+        self.setAutoDelete(True)
+
+    def run(self):
+        """Read the frame (may hit disk for h5py datasets) and hand it back."""
+        try:
+            frame_data = self.cache.get(self.stack, self.frame_index)
+            self.signals.frameRead.emit(self.frame_index, frame_data)
+        except Exception as e:
+            print(f"Error updating frame stats: {e}")
+
+
+class FramePrefetchWorker(qt.QRunnable):
+    """Worker reading frames around the current one into a FrameCache."""
+
+    def __init__(self, stack, frame_indices, cache):
+        super().__init__()
+        self.stack = stack
+        self.frame_indices = frame_indices
+        self.cache = cache
+        self.setAutoDelete(True)
+
+    def run(self):
+        """Read the frames; failures are ignored since this is only a hint."""
+        for frame_index in self.frame_indices:
+            try:
+                self.cache.prefetch(self.stack, frame_index)
+            except Exception:
+                return
+
+
 class _RoiStatsDisplayExWindow(qt.QMainWindow):
     """
     Main application window that integrates Plot2D/StackView with ROI management and statistics display.
@@ -28,6 +176,14 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         self.setWindowTitle("RHEED Analysis")
         # create a none camera object placeholder
         self.camera = None
+        # background thread delivering camera frames
+        self.capture_worker = None
+        # stack currently bound to the StackView (array or h5py dataset)
+        self._active_dataset = None
+        # recording dataset currently bound to the StackView
+        self._bound_dataset = None
+        # set while a recording view refresh is queued on the event loop
+        self._refresh_pending = False
         # View for holding objects like StackView, plot for holding the Plot component of the object
         self.view = None
         self.plot = None
@@ -55,8 +211,8 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         dataset_upload_action = qt.QAction("H5 Dataset upload", self)
         self.clear_dataset_action = qt.QAction("Clear Dataset", self)
         self.clear_dataset_action.setEnabled(False)  # Disabled until dataset is loaded
-        video_upload_action.triggered.connect(lambda : self._open_file("vid"))
-        dataset_upload_action.triggered.connect(lambda : self._open_file("h5"))
+        video_upload_action.triggered.connect(functools.partial(self._open_file, "vid"))
+        dataset_upload_action.triggered.connect(functools.partial(self._open_file, "h5"))
         self.clear_dataset_action.triggered.connect(self._clear_dataset)
         if file_menu is not None:
             file_menu.addAction(video_upload_action)
@@ -127,8 +283,23 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
          # widget for displaying stats results
         self._statsWidget = roiStatsWindow(parent=self, plot=self.plot, stackview=self.view, roimanager=self._regionManagerWidget.roiManager)
         
-        # Connect frame change signal to update current frame stats
-        self.view.sigFrameChanged.connect(self._on_frame_changed)
+        # single-thread pool reading frames for stats off the GUI thread
+        self._stats_pool = qt.QThreadPool(self)
+        self._stats_pool.setMaxThreadCount(1)
+
+        # recently read frames of the displayed h5py dataset
+        self._frame_cache = FrameCache()
+
+        # debounce slider drags: only the last frame index of a burst gets stats
+        self._pending_frame = None
+        self._frame_debounce = qt.QTimer(self)
+        self._frame_debounce.setSingleShot(True)
+        self._frame_debounce.setInterval(FRAME_DEBOUNCE_MS)
+        self._frame_debounce.timeout.connect(self._flush_pending_frame)
+
+        # Connect frame change signal to update current frame stats; queued so the
+        # slider handler returns first and the handler always runs on the GUI thread
+        self.view.sigFrameChanged.connect(self._on_frame_changed, qt.Qt.ConnectionType.QueuedConnection)
 
         # create Dock widgets
         self._roisTabWidgetDockWidget = qt.QDockWidget(parent=self)
@@ -139,6 +310,8 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         self._roiStatsWindowDockWidget = qt.QDockWidget(parent=self)
         self._roiStatsWindowDockWidget.setWidget(self._statsWidget)
         self.addDockWidget(qt.Qt.DockWidgetArea.RightDockWidgetArea, self._roiStatsWindowDockWidget)
+        # Frame stats are skipped while the dock is hidden; catch up when it reappears
+        self._roiStatsWindowDockWidget.visibilityChanged.connect(self._on_stats_dock_visibility)
 
         # Connect ROI signal to register ROI automatically
         self._regionManagerWidget.roiManager.sigRoiAdded.connect(self._on_roi_drawn)
@@ -149,9 +322,28 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             self._roisTabWidget.addTab(self._regionManagerWidget, "2D roi(s)")
         #self._roisTabWidget.addTab(self._curveRoiWidget, "1D roi(s)")
 
+    def _disable_gl_vsync(self):
+        """Set the GL plot's swap interval to 0, so redraws follow the camera rate.
+
+        silx gives its GL widget its own QSurfaceFormat, which overrides the
+        application default, so the swap interval is set on that widget. This
+        must happen before the widget is first shown.
+        """
+        handle = self.plot.getWidgetHandle()
+        if isinstance(handle, qt.QOpenGLWidget):
+            gl_widget = handle
+        else:
+            gl_widget = handle.findChild(qt.QOpenGLWidget) if handle is not None else None
+        if gl_widget is None:
+            return  # not the OpenGL backend
+        fmt = gl_widget.format()
+        fmt.setSwapInterval(0)
+        gl_widget.setFormat(fmt)
+
     def _init_StackView(self):
         self.view = StackView(parent=self, backend="gl")
         self.plot = self.view.getPlotWidget()
+        self._disable_gl_vsync()
         self.setCentralWidget(self.view)
         self.view.setKeepDataAspectRatio(True)
         self.view.setYAxisInverted(True)
@@ -164,7 +356,10 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         self.view._browser.setVisible(False)
         self.view._browser_label.setVisible(False)
 
-    def _open_file(self, file_type):
+    def _open_file(self, file_type, checked=False):
+        # `checked` is passed along by QAction.triggered and ignored
+        # imported on first use: pulls in imageio/ffmpeg
+        import gui.file_dialog as file_dialog
         file_path = file_dialog.open_file_path(file_type)
         if file_path is None:
             return
@@ -186,7 +381,7 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             # Save ROIs to current dataset before switching (if embed enabled)
             self._save_rois_before_switch()
             
-            playback = H5Playback(file_path, file_type)
+            playback = file_dialog.H5Playback(file_path, file_type)
             
             # Check if user cancelled conversion
             if playback.cancelled:
@@ -202,19 +397,28 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             # Store playback for cleanup
             self.playback = playback
             
-            # Get the actual H5 file path (may be different for video conversions)
-            if hasattr(playback, 'h5_file') and playback.h5_file is not None:
-                self.current_h5_path = playback.h5_file.filename
-            else:
-                self.current_h5_path = None
+            # Get the H5 file ROIs belong to (the converted file for videos, the
+            # user's file rather than the cached copy for rechunked datasets)
+            self.current_h5_path = playback.source_path
             
             print(f"Loaded dataset with shape {image_dataset.shape} from {file_path}")
             print(image_dataset)
-            self.view.setStack(image_dataset)
+            
+            # Read datasets that fit the memory budget with a single bulk HDF5
+            # read instead of letting silx slice the file frame by frame
+            stack = image_dataset
+            if isinstance(image_dataset, h5py.Dataset) and image_dataset.nbytes <= _in_memory_stack_budget():
+                stack = np.empty(image_dataset.shape, dtype=image_dataset.dtype)
+                image_dataset.read_direct(stack)
+            
+            self._set_stack(stack)
+            if stack is image_dataset and playback.frames_memmap is not None:
+                # Stats reads of a contiguous file go through the memory map
+                self._frame_cache.set_source(stack, playback.read_frame)
             self.view.setFrameNumber(0)
             
             # Update stats widget with new dataset
-            self._statsWidget.setDataset(image_dataset)
+            self._statsWidget.setDataset(stack)
             
             # Show browser controls when dataset is loaded
             self.view._browser.setVisible(True)
@@ -236,7 +440,8 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         captured_embed_enabled = self._regionManagerWidget.isEmbedChecked()
         
         # Clear the StackView (releases dataset reference, removes ROIs)
-        self.view.setStack(None)
+        self._set_stack(None)
+        self._frame_cache.clear()
         
         # Update stats widget to clear dataset
         self._statsWidget.setDataset(None)
@@ -264,6 +469,8 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         self._regionManagerWidget.setEmbedEnabled(False)
         
     def _camera_connect_menu(self):
+        # camera modules are imported on first use: they pull in OpenCV
+        from gui.camera_connect_dialog import CameraConnectWindow
         self.cmw = CameraConnectWindow()
         self.cmw.show()
         self.cmw.backendValuePicked.connect(self._camera_init)
@@ -275,6 +482,7 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
     
     def _camera_settings_menu(self):
         if self.camera is not None:
+            from gui.camera_settings_dialog import CameraSettingsWindow
             self.cmw = CameraSettingsWindow(camera_init=self.camera)
             self.cmw.show()
 
@@ -286,7 +494,7 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             self.syncButton.setVisible(visible)
 
     def _stop_camera(self):
-        """Stop capture loop, timer, and release camera resources."""
+        """Stop capture thread and release camera resources."""
         # Prompt to save live stats before stopping camera
         if hasattr(self, '_statsWidget') and self._statsWidget is not None:
             self._statsWidget.promptSaveLiveData()
@@ -296,17 +504,21 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         if self.camera is not None and self.camera.is_recording:
             self._save_rois_to_current_h5()
         
-        # Stop timer
-        if hasattr(self, "timer") and self.timer is not None:
+        # Stop capture thread
+        if self.capture_worker is not None:
             try:
-                self.timer.stop()
+                self.capture_worker.frameReady.disconnect(self._camera_loop)
             except Exception:
                 pass
             try:
-                self.timer.deleteLater()
+                self.capture_worker.stop()
             except Exception:
                 pass
-            self.timer = None
+            try:
+                self.capture_worker.deleteLater()
+            except Exception:
+                pass
+            self.capture_worker = None
 
         # Hide browser controls
         self._set_browse_controls_visible(False)
@@ -328,9 +540,11 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         # Clear plot stack if applicable
         if hasattr(self, "view") and isinstance(self.view, StackView):
             try:
-                self.view.setStack(None)
+                self._set_stack(None)
             except Exception:
                 pass
+        self._bound_dataset = None
+        self._frame_cache.clear()
 
         # Release camera
         if self.camera is not None:
@@ -350,6 +564,7 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             self._regionManagerWidget.setEmbedEnabled(False)
 
     def _camera_init(self, port, backend, name, fps):
+        from camera.opencv_capture import CameraInit, CaptureWorker
         try:
             # Stop any existing camera/session before reinitializing
             self._stop_camera()
@@ -361,16 +576,12 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
                 self.syncButton = None
             # create an icon button to sync the stackview and its FPS speed with the camera
             self.syncButton = qt.QPushButton("Sync", self)
-            app_style = self.style()
-            icon = qt.QIcon()
-            if app_style is not None:
-                icon = app_style.standardIcon(qt.QStyle.StandardPixmap.SP_BrowserReload)
+            icon = _std_icon(qt.QStyle.StandardPixmap.SP_BrowserReload)
             self.syncButton.setIcon(icon)
             self.syncButton.setLayoutDirection(qt.Qt.LayoutDirection.RightToLeft)
             self.syncButton.setIconSize(qt.QSize(20, 20))
             self.syncButton.setToolTip("Sync the stackview with the camera")
             self.syncButton.setCheckable(True)
-            self.syncButton.clicked.connect(self._sync_camera)
             self.syncButton.toggled.connect(self._sync_camera)
             # add the sync button to the slider browser layout
             self.view._browser.mainLayout.addWidget(self.syncButton)
@@ -381,11 +592,11 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             if self.camera.latest_frame is not None:
                 print(self.camera.latest_frame.shape)
                 # Remove first dimension if present (1, H, W) -> (H, W)
-                frame = self.camera.latest_frame[0] if self.camera.latest_frame.ndim == 3 else self.camera.latest_frame
+                frame = self._as_display_frame(self.camera.latest_frame)
                 self.current_frame = frame
                 self.plot.addImage(frame)
                 #self._hiddenPlot2D.addImage(frame)
-                self.view.setStack(self.camera.latest_frame)
+                self._set_stack(self.camera.latest_frame)
                 self.view.setFrameNumber(0)
                 
                 # Update stats widget with live frame dataset
@@ -394,26 +605,14 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             # Enable live mode for stats tracking (camera preview without recording)
             self._statsWidget.setLiveMode(True)
 
-            # connect the resize callback to the camera
-            #self.camera.on_resize = lambda new_dataset: self.dataResized.emit(self.plot, new_dataset)
-
             # connect the resize signal to the plot
             self.dataResized.connect(self.update_dataset)
             
-            # create and start a timer to capture frames at the camera FPS rate
-            self.timer = qt.QTimer(self)
-            # Compute integer interval from FPS
-            try:
-                fps_val = float(self.camera.getFPS())
-                if fps_val > 0:
-                    interval_ms = int(round(1000 / fps_val))
-                else:
-                    interval_ms = 1000  # ~1 FPS fallback
-            except Exception:
-                interval_ms = 1000  # fallback if getFPS fails
-
-            self.timer.start(interval_ms)
-            self.timer.timeout.connect(self._camera_loop)
+            # capture frames on a background thread; each frame is delivered
+            # to _camera_loop on the GUI thread as soon as it is captured
+            self.capture_worker = CaptureWorker(self.camera)
+            self.capture_worker.frameReady.connect(self._camera_loop, qt.Qt.ConnectionType.QueuedConnection)
+            self.capture_worker.start()
 
         except Exception as e:
             print(f"Failed to initialize camera: {e}")
@@ -421,7 +620,7 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
 
     def _update_camera_menu_state(self):
         """Update camera menu actions based on camera connection state."""
-        is_connected = self.camera is not None and self.camera.cap is not None and self.camera.cap.isOpened()
+        is_connected = self.camera is not None and self.camera.is_open
         is_recording = is_connected and self.camera.is_recording
         
         self.disconnect_camera_action.setEnabled(is_connected)
@@ -432,8 +631,15 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         if self.camera_dshow_settings_action is not None:
             self.camera_dshow_settings_action.setEnabled(is_connected)
 
-    def _sync_camera(self):
-        self.view.setFrameNumber(self.camera.getCurrentFrame())
+    def _sync_camera(self, checked=True):
+        # Only jump to the camera frame when sync is switched on
+        if not checked or self.camera is None:
+            return
+        frame_number = self.camera.getCurrentFrame()
+        # Nothing recorded yet, or already there - avoid a redundant frame change
+        if frame_number < 0 or frame_number == self.view.getFrameNumber():
+            return
+        self.view.setFrameNumber(frame_number)
 
     def _start_recording(self):
         """Start recording: show file dialog, then begin HDF5 capture and bind dataset to StackView."""
@@ -471,7 +677,7 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         # Start recording
         self.camera.start_recording(file_path)
         self._recording_last_frame_count = 0  # Track frame count for browser updates
-        self._recording_dataset_bound = False  # Track if we've bound the dataset
+        self._bound_dataset = None  # Recording dataset currently bound to the StackView
         self.current_h5_path = file_path  # Track for ROI embedding
         
         # Update stats widget with recording dataset (will be set properly in camera loop)
@@ -498,11 +704,15 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         # Save ROIs to recording before stopping (if embed enabled)
         self._save_rois_to_current_h5()
         
-        # Clear StackView before stopping to prevent access to closed dataset
-        self.view.setStack(None)
+        # Detach the recording before stopping to prevent access to the closed
+        # dataset: rebind the live frame buffer rather than clearing the view,
+        # which would also tear down the drawn ROIs
+        self._set_stack(self.camera.latest_frame)
+        self._statsWidget.setDataset(None)
+        self._frame_cache.clear()
         
         # Reset recording tracking state
-        self._recording_dataset_bound = False
+        self._bound_dataset = None
         self._recording_last_frame_count = 0
         
         file_path = self.camera.stop_recording()
@@ -525,77 +735,152 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         self.start_recording_action.setEnabled(True)
         self.stop_recording_action.setEnabled(False)
 
-    def _camera_loop(self):
-        if self.camera is not None and self.camera.cap.isOpened():
-            self.camera.capture_frame()
-            
-            if self.camera.is_recording and self.camera.image_dataset is not None:
-                # Recording mode: update StackView with the HDF5 dataset
-                frame_count = self.camera.frame_index
-                
-                if frame_count > 0:
-                    # Bind dataset on first frame or after resize
-                    current_stack = self.view.getStack(copy=False, returnNumpyArray=False)
-                    needs_rebind = (not getattr(self, '_recording_dataset_bound', False) or 
-                                   current_stack is None or 
-                                   current_stack[0] is not self.camera.image_dataset)
-                    
-                    if needs_rebind:
-                        # Preserve current frame position when rebinding
-                        current_frame = self.view.getFrameNumber() if self._recording_dataset_bound else 0
-                        self.view.setStack(self.camera.image_dataset)
-                        self._recording_dataset_bound = True
-                        
-                        # Update stats widget with recording dataset
-                        self._statsWidget.setDataset(self.camera.image_dataset)
-                        
-                        # Set initial range
-                        self.view._browser.setRange(0, frame_count - 1)
-                        # Restore frame position (clamped to valid range)
-                        restored_frame = min(current_frame, frame_count - 1)
-                        self.view.setFrameNumber(restored_frame)
-                    
-                    # Update browser range only when frame count changes
-                    last_count = getattr(self, '_recording_last_frame_count', 0)
-                    if frame_count != last_count:
-                        # Save current position before updating range
-                        current_pos = self.view.getFrameNumber()
-                        self.view._browser.setRange(0, frame_count - 1)
-                        # Restore position if not syncing
-                        if self.syncButton is None or not self.syncButton.isChecked():
-                            # Keep user's position, clamped to valid range
-                            self.view.setFrameNumber(min(current_pos, frame_count - 1))
-                        self._recording_last_frame_count = frame_count
-                    
-                    # Auto-sync to latest frame if sync button is checked
-                    if self.syncButton is not None and self.syncButton.isChecked():
-                        self.view.setFrameNumber(frame_count - 1)
+    def _camera_loop(self, frame):
+        """Display a frame delivered by the capture worker (runs on the GUI thread)."""
+        camera = self.camera
+        if camera is not None and camera.is_open:
+            if camera.is_recording and camera.image_dataset is not None:
+                # Recording mode: coalesce StackView updates, at most one per event loop pass
+                if not self._refresh_pending:
+                    self._refresh_pending = True
+                    qt.QTimer.singleShot(0, self._refresh_recording_view)
             else:
-                # Live preview mode: update the plot with latest frame
-                if self.camera.latest_frame is not None:
-                    frame = self.camera.latest_frame[0] if self.camera.latest_frame.ndim == 3 else self.camera.latest_frame
+                # Live preview mode: update the plot with the delivered frame
+                if frame is not None:
+                    frame = self._as_display_frame(frame)
                     self.current_frame = frame
-                    self.plot.addImage(self.current_frame, replace=True, resetzoom=False)
+                    self._show_live_frame(frame)
                     
                     # Update stats widget with current live frame
                     self._statsWidget.updateCurrentFrame(0, frame)
     
+    def _refresh_recording_view(self):
+        """Bind the recording dataset to the StackView and update the browser range.
+
+        Queued by `_camera_loop` so several frames arriving in one event loop pass
+        result in a single rebind/repaint.
+        """
+        self._refresh_pending = False
+        camera = self.camera
+        if camera is None or not camera.is_recording:
+            return
+        dataset = camera.image_dataset
+        frame_count = camera.frame_index
+        if dataset is None or frame_count <= 0:
+            return
+
+        view = self.view
+        set_range = view._browser.setRange
+        get_frame = view.getFrameNumber
+        set_frame = view.setFrameNumber
+        last_frame = frame_count - 1
+
+        # Bind dataset on first frame (or if the camera switched datasets)
+        if self._bound_dataset is not dataset:
+            # Preserve current frame position when rebinding
+            current_frame = get_frame() if self._bound_dataset is not None else 0
+            self._set_stack(dataset)
+            self._bound_dataset = dataset
+
+            # Update stats widget with recording dataset
+            self._statsWidget.setDataset(dataset)
+
+            # Set initial range
+            set_range(0, last_frame)
+            # Restore frame position (clamped to valid range)
+            set_frame(min(current_frame, last_frame))
+            self._recording_last_frame_count = frame_count
+        else:
+            # Same dataset, possibly grown in place: resize the stats arrays only
+            self._statsWidget.resizeDataset()
+
+        # Update browser range a few times per second, or on every new frame
+        # while syncing so the latest frame is reachable
+        syncing = self.syncButton is not None and self.syncButton.isChecked()
+        range_step = max(RECORDING_RANGE_STEP, int(camera.getFPS()) // RANGE_UPDATES_PER_SECOND)
+        new_frames = frame_count - getattr(self, '_recording_last_frame_count', 0)
+        if new_frames >= range_step or (syncing and new_frames > 0):
+            # Save current position before updating range
+            current_pos = get_frame()
+            set_range(0, last_frame)
+            # Restore position if not syncing
+            if not syncing:
+                # Keep user's position, clamped to valid range
+                set_frame(min(current_pos, last_frame))
+            self._recording_last_frame_count = frame_count
+
+        # Auto-sync to latest frame if sync button is checked
+        if syncing and get_frame() != last_frame:
+            set_frame(last_frame)
+
+    def _show_live_frame(self, frame):
+        """Show a live frame, updating the existing live image item in place.
+
+        The item is only (re)created on the first frame, when something else
+        replaced it, or when the frame shape/dtype changes.
+        """
+        item = self.plot.getImage(LIVE_IMAGE_LEGEND)
+        if item is not None:
+            current = item.getData(copy=False)
+            if current.shape == frame.shape and current.dtype == frame.dtype:
+                item.setData(frame, copy=False)
+                return
+        self.plot.addImage(frame, legend=LIVE_IMAGE_LEGEND, replace=True, resetzoom=False)
+
+    def _as_display_frame(self, buffer):
+        """Return a C-contiguous 2D view of a (1, H, W) or (H, W) frame buffer.
+
+        A copy is only made when the buffer is not already C-contiguous, so the
+        common path hands silx the camera buffer itself (zero-copy GL upload).
+        """
+        frame = buffer[0] if buffer.ndim == 3 else buffer
+        if not frame.flags['C_CONTIGUOUS']:
+            frame = np.ascontiguousarray(frame)
+        return frame
+
     def _on_frame_changed(self, frame_index):
-        """Handle frame change in StackView - update stats for new frame."""
-        # Get current frame data from view
-        stack = self.view.getStack(copy=False, returnNumpyArray=False)
-        
+        """Handle frame change in StackView - schedule stats for the new frame."""
+        # Restarting the timer drops the intermediate positions of a slider drag
+        self._pending_frame = frame_index
+        self._frame_debounce.start()
+
+    def _flush_pending_frame(self):
+        """Update stats for the last frame selected in the StackView."""
+        frame_index = self._pending_frame
+        self._pending_frame = None
+        if frame_index is None:
+            return
+
+        # Nobody sees the current-frame stats while the dock is hidden
+        if not self._roiStatsWindowDockWidget.isVisible():
+            return
+
+        stack = self._active_dataset
         if stack is not None and len(stack) > frame_index:
-            try:
-                if hasattr(stack, '__getitem__'):
-                    frame_data = stack[frame_index]
-                else:
-                    frame_data = None
-                
-                # Update stats widget
-                self._statsWidget.updateCurrentFrame(frame_index, frame_data)
-            except Exception as e:
-                print(f"Error updating frame stats: {e}")
+            # Drop the previous request if it has not started yet
+            self._stats_pool.clear()
+            worker = FrameReadWorker(stack, frame_index, self._frame_cache)
+            worker.signals.frameRead.connect(self._update_frame_stats, qt.Qt.ConnectionType.QueuedConnection)
+            self._stats_pool.start(worker)
+
+            # Read the neighbouring frames next, so scrubbing on is served from RAM
+            if isinstance(stack, h5py.Dataset):
+                neighbours = [frame_index + offset for offset in PREFETCH_OFFSETS
+                              if 0 <= frame_index + offset < len(stack)]
+                if neighbours:
+                    self._stats_pool.start(FramePrefetchWorker(stack, neighbours, self._frame_cache))
+
+    def _on_stats_dock_visibility(self, visible):
+        """Refresh the current-frame stats skipped while the stats dock was hidden."""
+        if visible and self._active_dataset is not None:
+            self._on_frame_changed(self.view.getFrameNumber())
+
+    def _update_frame_stats(self, frame_index, frame_data):
+        """Queue stats for a frame read by a FrameReadWorker (runs on the GUI thread)."""
+        # Skip results for frames the slider has already moved past
+        if frame_index != self.view.getFrameNumber():
+            return
+        self._statsWidget.updateCurrentFrame(frame_index, frame_data)
     
     def _on_roi_drawn(self, roi):
         """
@@ -614,11 +899,20 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         aw = AboutWindow(self)
         aw.show()
 
+    def _set_stack(self, stack):
+        """Bind a stack to the StackView and remember it as the frame source for stats."""
+        self._active_dataset = stack
+        self.view.setStack(stack)
+
     def update_dataset(self, plot, dataset):
         """Update the plot with the new dataset"""
         framenum = plot.getFrameNumber()
+        # Rebind in place: refcounting frees the old stack once silx drops it
         plot.setStack(dataset)
-        plot.setFrameNumber(framenum)
+        if plot is self.view:
+            self._active_dataset = dataset
+        if dataset is not None and len(dataset) > 0:
+            plot.setFrameNumber(min(framenum, len(dataset) - 1))
 
     def _save_rois_to_current_h5(self, rois=None, embed_enabled=None, h5_path=None):
         """Save ROIs to the current H5 file if embed is enabled.
@@ -638,8 +932,15 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         if save_path is None:
             return
         
+        # A recording in progress is written through the camera's open handle
+        # instead of reopening the file
+        target = save_path
+        camera_file = getattr(self.camera, "h5_file", None)
+        if camera_file is not None and os.path.abspath(camera_file.filename) == os.path.abspath(save_path):
+            target = camera_file
+        
         # Check if file is writable
-        if not roidict.h5_is_writable(save_path):
+        if target is save_path and not roidict.h5_is_writable(save_path):
             qt.QMessageBox.warning(self, "Read-Only Dataset",
                 "This dataset is read-only. ROIs cannot be embedded.\n\n"
                 "Please save ROIs manually using the Save button in the ROI panel.")
@@ -660,9 +961,14 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             if reply != qt.QMessageBox.Yes:
                 return
         
-        success = roidict.save_rois_to_h5(rois, save_path, embed_enabled=embed_enabled)
+        success = roidict.save_rois_to_h5(rois, target, embed_enabled=embed_enabled)
         if success:
             print(f"Saved {len(rois)} ROIs to {self.current_h5_path}")
+            if target is save_path:
+                # Writing ROIs changed the file's mtime and size; keep its
+                # rechunked copy (if any) valid
+                import gui.file_dialog as file_dialog
+                file_dialog.refresh_rechunk_stamp(save_path)
         else:
             qt.QMessageBox.warning(self, "Save Failed",
                 "Failed to save ROIs to the dataset. Please save manually using the Save button.")
@@ -694,14 +1000,20 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
             self._regionManagerWidget.setEmbedEnabled(True, checked=True)
             return
         
+        # Read through the playback's open handle when it is the same file
+        source = self.current_h5_path
+        playback_file = self.playback.h5_file if self.playback is not None else None
+        if playback_file is not None and os.path.abspath(playback_file.filename) == os.path.abspath(self.current_h5_path):
+            source = playback_file
+        
         # Check if H5 has saved ROIs
-        if not roidict.h5_has_rois(self.current_h5_path):
+        if not roidict.h5_has_rois(source):
             # No ROIs in file, just enable embed
             self._regionManagerWidget.setEmbedEnabled(True, checked=True)
             return
         
         # Load ROIs from file
-        saved_rois, embed_enabled = roidict.load_rois_from_h5(self.current_h5_path, plot=self.plot)
+        saved_rois, embed_enabled = roidict.load_rois_from_h5(source, plot=self.plot)
         
         if saved_rois is None:
             self._regionManagerWidget.setEmbedEnabled(True, checked=True)
@@ -755,6 +1067,7 @@ class _RoiStatsDisplayExWindow(qt.QMainWindow):
         
         # Cleanup stats widget (stop computation engine)
         if hasattr(self, '_statsWidget'):
+            self._stats_pool.clear()
             self._statsWidget.cleanup()
         
         self._stop_camera()
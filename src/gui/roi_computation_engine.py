@@ -7,7 +7,13 @@ import numpy as np
 from silx.gui import qt
 import queue
 import time
-from gui.roi_mask_utils import ROIMaskUtils
+from gui.roi_mask_utils import ROIMaskUtils, BLOCK_READ_BYTES
+
+# Frames per bulk-analysis step (progress report / priority check granularity)
+BULK_CHUNK_FRAMES = 100
+
+# Minimum time between bulk progress signals for one ROI
+BULK_PROGRESS_INTERVAL_S = 0.1
 
 
 class ROIComputationWorker(qt.QRunnable):
@@ -96,11 +102,13 @@ class ROIComputationEngine(qt.QThread):
         self.priority_queue = queue.Queue()
         
         # Chunk size for bulk processing (frames per iteration)
-        self.chunk_size = 100
+        self.chunk_size = BULK_CHUNK_FRAMES
+        
+        # Newest dataset frame queued for a current-frame update; older results are not shown
+        self._latest_current_frame = None
         
-        # Track pending workers for current frame
-        self._pending_workers = 0
-        self._pending_lock = qt.QMutex()
+        # Buffer bulk blocks of h5py datasets are read into (see set_dataset)
+        self._read_buffer = None
     
     def set_dataset(self, dataset):
         """
@@ -114,6 +122,23 @@ class ROIComputationEngine(qt.QThread):
             self.dataset_shape = dataset.shape
         else:
             self.dataset_shape = None
+        
+        # Bulk steps span whole HDF5 chunks, so each chunk is decoded by one step only
+        chunks = getattr(dataset, 'chunks', None)
+        frames_per_chunk = chunks[0] if chunks and len(chunks) == 3 else 1
+        self.chunk_size = max(frames_per_chunk, BULK_CHUNK_FRAMES - BULK_CHUNK_FRAMES % frames_per_chunk)
+        
+        # One read buffer per dataset for bulk blocks: a bulk step of full frames,
+        # capped like the blocks themselves; kept while frame shape and dtype match
+        if dataset is not None and len(dataset.shape) == 3 and hasattr(dataset, 'read_direct'):
+            frame_size = dataset.shape[1] * dataset.shape[2]
+            size = min(self.chunk_size * frame_size,
+                       max(BLOCK_READ_BYTES // dataset.dtype.itemsize, frame_size))
+            buffer = self._read_buffer
+            if buffer is None or buffer.dtype != dataset.dtype or buffer.size != size:
+                self._read_buffer = np.empty(size, dtype=dataset.dtype)
+        else:
+            self._read_buffer = None
     
     def queue_bulk_analysis(self, roi_name, roi, total_frames):
         """
@@ -173,7 +198,7 @@ class ROIComputationEngine(qt.QThread):
             # Check priority queue first (current frame updates)
             try:
                 task = self.priority_queue.get(timeout=0.01)
-                self._process_priority_task(task)
+                self._process_priority_task(self._coalesce_priority_tasks(task))
                 continue
             except queue.Empty:
                 pass
@@ -190,6 +215,24 @@ class ROIComputationEngine(qt.QThread):
                 # Paused, just sleep
                 time.sleep(0.1)
     
+    def _coalesce_priority_tasks(self, task):
+        """
+        Drain queued current-frame updates and return the newest one.
+        
+        Dataset browsing only needs the frame the user stopped on. Live mode
+        updates append to the live timeseries, so they are processed in order
+        and never dropped.
+        """
+        while True:
+            try:
+                newer = self.priority_queue.get_nowait()
+            except queue.Empty:
+                return task
+            if task[-1]:
+                # Live update: run it now and keep draining behind it
+                self._process_priority_task(task)
+            task = newer
+    
     def _process_priority_task(self, task):
         """Process a high-priority current frame update - uses thread pool for parallel computation."""
         task_type, frame_index, frame_data, roi_list, is_live_mode = task
@@ -197,11 +240,10 @@ class ROIComputationEngine(qt.QThread):
         if task_type != 'current':
             return
         
-        # Compute all ROIs in parallel using thread pool
-        self._pending_lock.lock()
-        self._pending_workers = len(roi_list)
-        self._pending_lock.unlock()
+        if not is_live_mode:
+            self._latest_current_frame = frame_index
         
+        # Compute all ROIs in parallel using thread pool
         for roi_name, roi in roi_list:
             # Create worker for this ROI (pass is_live_mode flag)
             worker = ROIComputationWorker(roi_name, roi, frame_index, frame_data, self.cache, is_live_mode)
@@ -215,25 +257,17 @@ class ROIComputationEngine(qt.QThread):
     
     def _on_worker_finished(self, roi_name, frame_index, mean_value, is_live_mode):
         """Handle worker completion - called from worker thread."""
-        # Emit signal for GUI update (thread-safe Qt signal)
-        self.currentFrameReady.emit(roi_name, mean_value)
-        
-        # Decrement pending counter
-        self._pending_lock.lock()
-        self._pending_workers -= 1
-        self._pending_lock.unlock()
+        # Emit signal for GUI update (thread-safe Qt signal), unless a newer
+        # frame was requested meanwhile - the value is still kept in the cache
+        if is_live_mode or frame_index == self._latest_current_frame:
+            self.currentFrameReady.emit(roi_name, mean_value)
     
     def _on_worker_error(self, roi_name, error_msg):
         """Handle worker error - called from worker thread."""
         self.errorOccurred.emit(roi_name, error_msg)
-        
-        # Decrement pending counter
-        self._pending_lock.lock()
-        self._pending_workers -= 1
-        self._pending_lock.unlock()
     
     def _process_bulk_task(self, task):
-        """Process a bulk analysis task in chunks - uses thread pool for parallel frame processing."""
+        """Process a bulk analysis task in chunks of frames read and reduced as numpy blocks."""
         task_type, roi_name, roi, total_frames = task
         
         if task_type != 'bulk':
@@ -245,18 +279,18 @@ class ROIComputationEngine(qt.QThread):
         
         try:
             # Get frames that need computation
-            frames_to_compute = []
-            for frame_idx in range(total_frames):
-                if self.cache.get_mean(roi_name, frame_idx) is None:
-                    frames_to_compute.append(frame_idx)
-            
-            if len(frames_to_compute) == 0:
+            missing = self.cache.missing_frames(roi_name)
+            missing = missing[missing < total_frames]
+            if len(missing) == 0:
                 # Already fully computed
                 self.bulkAnalysisComplete.emit(roi_name)
                 return
             
-            # Process in chunks - submit chunk to thread pool for parallel processing
-            for i in range(0, len(frames_to_compute), self.chunk_size):
+            # Process the chunks of consecutive frames holding missing frames,
+            # each read and reduced as a block
+            last_progress = time.monotonic()
+            for chunk_start in np.unique(missing // self.chunk_size) * self.chunk_size:
+                chunk_start = int(chunk_start)
                 if not self._running:
                     break
                 
@@ -266,52 +300,30 @@ class ROIComputationEngine(qt.QThread):
                     self.task_queue.put(task)
                     return
                 
-                chunk = frames_to_compute[i:i + self.chunk_size]
-                
-                # Submit chunk frames to thread pool for parallel computation
-                # Track workers for this chunk
-                chunk_workers = []
-                
-                for frame_idx in chunk:
-                    if not self._running:
-                        break
-                    
-                    try:
-                        # Get frame data
-                        if self.dataset.ndim == 3:
-                            frame_data = self.dataset[frame_idx]
-                        elif self.dataset.ndim == 2:
-                            frame_data = self.dataset
-                        else:
-                            continue
-                        
-                        # Create worker for this frame
-                        worker = ROIComputationWorker(roi_name, roi, frame_idx, frame_data, self.cache)
-                        # Don't connect signals for bulk processing (too many emissions)
-                        # Results are stored in cache directly
-                        chunk_workers.append(worker)
-                        
-                        # Submit to thread pool
-                        self.thread_pool.start(worker)
-                        
-                    except Exception as e:
-                        error_msg = f"Error at frame {frame_idx}: {e}"
-                        print(error_msg)
-                        # Continue with other frames
-                
-                # Wait for chunk to complete before emitting progress
-                # Use active count to avoid blocking the main thread too long
-                wait_count = 0
-                while self.thread_pool.activeThreadCount() > 0 and wait_count < 100:
-                    time.sleep(0.01)  # 10ms
-                    wait_count += 1
-                
-                # Emit progress update
-                computed, total = self.cache.get_progress(roi_name)
-                self.bulkProgressUpdated.emit(roi_name, computed, total)
+                chunk_stop = min(chunk_start + self.chunk_size, total_frames)
+                try:
+                    if self.dataset.ndim == 3:
+                        # Frames past the end of a growing dataset are computed later
+                        chunk_stop = min(chunk_stop, len(self.dataset))
+                        means = ROIMaskUtils.compute_means_for_frames(
+                            roi, self.dataset, chunk_start, chunk_stop, self._read_buffer)
+                    elif self.dataset.ndim == 2:
+                        mean_value = ROIMaskUtils.compute_mean_for_roi(roi, self.dataset[()])
+                        means = np.full(chunk_stop - chunk_start, mean_value)
+                    else:
+                        continue
+                    self.cache.set_means(roi_name, chunk_start, means)
+                except Exception as e:
+                    error_msg = f"Error at frames {chunk_start}-{chunk_stop - 1}: {e}"
+                    print(error_msg)
+                    # Continue with other chunks
                 
-                # Small yield to prevent blocking
-                time.sleep(0.001)
+                # Emit progress update, throttled - chunks can finish in a few ms
+                now = time.monotonic()
+                if now - last_progress >= BULK_PROGRESS_INTERVAL_S:
+                    last_progress = now
+                    computed, total = self.cache.get_progress(roi_name)
+                    self.bulkProgressUpdated.emit(roi_name, computed, total)
             
             # Analysis complete
             if self._running:
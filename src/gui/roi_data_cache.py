@@ -8,6 +8,9 @@ import threading
 import datetime
 import os
 
+# Initial capacity (samples per ROI) of the live capture buffers; doubled when full
+LIVE_BUFFER_INITIAL_SIZE = 1024
+
 
 class ROIDataCache:
     """Thread-safe cache for ROI statistics data."""
@@ -20,7 +23,8 @@ class ROIDataCache:
         # {roi_name: {
         #     'roi_ref': ROI object,
         #     'means': np.array of mean values,
-        #     'computed_frames': set of frame indices that have been computed,
+        #     'computed': bool array, True for frames that have been computed,
+        #     'computed_count': number of True entries in 'computed',
         #     'total_frames': int total frames in dataset,
         #     'color': QColor for display
         # }}
@@ -56,7 +60,7 @@ class ROIDataCache:
         """Check if there is any live capture data to save."""
         with self._lock:
             for roi_name in self._live_data:
-                if len(self._live_data[roi_name]['means']) > 0:
+                if self._live_data[roi_name]['length'] > 0:
                     return True
             return False
     
@@ -82,17 +86,14 @@ class ROIDataCache:
             self._data[roi_name] = {
                 'roi_ref': roi_ref,
                 'means': np.zeros(total_frames, dtype=np.float32),
-                'computed_frames': set(),
+                'computed': np.zeros(total_frames, dtype=bool),
+                'computed_count': 0,
                 'total_frames': total_frames,
                 'color': color
             }
             
             # Also initialize live data storage for this ROI
-            self._live_data[roi_name] = {
-                'means': [],  # Dynamic list for live mode
-                'timestamps': [],  # Store timestamps for each frame
-                'color': color
-            }
+            self._live_data[roi_name] = dict(self._new_live_buffers(), color=color)
     
     def remove_roi(self, roi_name):
         """Remove an ROI from the cache."""
@@ -122,16 +123,52 @@ class ROIDataCache:
             
             data = self._data[roi_name]
             
-            # Resize array if needed
+            # Resize arrays if needed
             if frame_index >= len(data['means']):
-                new_size = max(frame_index + 1, data['total_frames'])
-                old_means = data['means']
-                data['means'] = np.zeros(new_size, dtype=np.float32)
-                data['means'][:len(old_means)] = old_means
-                data['total_frames'] = new_size
+                self._grow(data, max(frame_index + 1, data['total_frames']))
+                data['total_frames'] = len(data['means'])
             
             data['means'][frame_index] = mean_value
-            data['computed_frames'].add(frame_index)
+            if not data['computed'][frame_index]:
+                data['computed'][frame_index] = True
+                data['computed_count'] += 1
+    
+    def set_means(self, roi_name, start_frame, mean_values):
+        """
+        Set the mean values for consecutive frames starting at start_frame.
+        
+        Args:
+            roi_name: String identifier for the ROI
+            start_frame: Frame number (0-based) of the first value
+            mean_values: 1D array of mean intensity values
+        """
+        with self._lock:
+            if roi_name not in self._data:
+                return
+            
+            data = self._data[roi_name]
+            end_frame = start_frame + len(mean_values)
+            
+            # Resize arrays if needed
+            if end_frame > len(data['means']):
+                self._grow(data, max(end_frame, data['total_frames']))
+                data['total_frames'] = len(data['means'])
+            
+            data['means'][start_frame:end_frame] = mean_values
+            computed = data['computed'][start_frame:end_frame]
+            data['computed_count'] += len(computed) - int(np.count_nonzero(computed))
+            computed[:] = True
+    
+    @staticmethod
+    def _grow(data, new_size):
+        """Enlarge the means/computed arrays of an ROI entry to new_size frames (lock held)."""
+        old_size = len(data['means'])
+        means = np.zeros(new_size, dtype=np.float32)
+        means[:old_size] = data['means']
+        computed = np.zeros(new_size, dtype=bool)
+        computed[:old_size] = data['computed']
+        data['means'] = means
+        data['computed'] = computed
     
     def append_live_mean(self, roi_name, mean_value, timestamp=None):
         """
@@ -149,14 +186,32 @@ class ROIDataCache:
             if timestamp is None:
                 timestamp = datetime.datetime.now()
             
-            self._live_data[roi_name]['means'].append(mean_value)
-            self._live_data[roi_name]['timestamps'].append(timestamp)
+            data = self._live_data[roi_name]
+            length = data['length']
+            if length == len(data['means']):
+                # Buffers full - grow geometrically so appends stay amortized O(1)
+                for key in ('means', 'timestamps'):
+                    grown = np.empty(2 * length, dtype=data[key].dtype)
+                    grown[:length] = data[key]
+                    data[key] = grown
+            data['means'][length] = mean_value
+            data['timestamps'][length] = np.datetime64(timestamp, 'us')
+            data['length'] = length + 1
             
             # Update frame counter to max across all ROIs
-            current_len = len(self._live_data[roi_name]['means'])
+            current_len = length + 1
             if current_len > self._live_frame_counter:
                 self._live_frame_counter = current_len
     
+    @staticmethod
+    def _new_live_buffers():
+        """Return empty live capture buffers for one ROI (means, timestamps, fill length)."""
+        return {
+            'means': np.empty(LIVE_BUFFER_INITIAL_SIZE, dtype=np.float32),
+            'timestamps': np.empty(LIVE_BUFFER_INITIAL_SIZE, dtype='datetime64[us]'),
+            'length': 0,
+        }
+    
     def get_live_means(self, roi_name):
         """
         Get all live capture mean values for an ROI.
@@ -168,13 +223,15 @@ class ROIDataCache:
             if roi_name not in self._live_data:
                 return np.array([]), np.array([])
             
-            means_list = self._live_data[roi_name]['means']
+            data = self._live_data[roi_name]
+            length = data['length']
             
-            if len(means_list) == 0:
+            if length == 0:
                 return np.array([]), np.array([])
             
-            frames = np.arange(len(means_list), dtype=np.int32)
-            means = np.array(means_list, dtype=np.float32)
+            # A view: recorded samples are never overwritten, only appended after
+            frames = np.arange(length, dtype=np.int32)
+            means = data['means'][:length]
             
             return frames, means
     
@@ -182,8 +239,8 @@ class ROIDataCache:
         """Clear all live capture data but keep ROI registrations."""
         with self._lock:
             for roi_name in self._live_data:
-                self._live_data[roi_name]['means'] = []
-                self._live_data[roi_name]['timestamps'] = []
+                # Fresh buffers, so views handed out earlier keep their values
+                self._live_data[roi_name].update(self._new_live_buffers())
             self._live_frame_counter = 0
             self._live_start_time = None
     
@@ -203,7 +260,7 @@ class ROIDataCache:
             bool: True if successful, False otherwise
         """
         import h5py
-        from gui.roidictionary import roi_to_dict
+        from gui.roidictionary import roi_to_dict, h5_compression_options
         
         with self._lock:
             try:
@@ -230,15 +287,17 @@ class ROIDataCache:
                         roi_group = ts_group.create_group(roi_name)
                         
                         # Store mean values
-                        means = self._live_data[roi_name]['means']
-                        if len(means) > 0:
-                            roi_group.create_dataset('means', data=np.array(means, dtype=np.float32))
-                            roi_group.create_dataset('frames', data=np.arange(len(means), dtype=np.int32))
+                        length = self._live_data[roi_name]['length']
+                        if length > 0:
+                            means = self._live_data[roi_name]['means'][:length]
+                            frames = np.arange(len(means), dtype=np.int32)
+                            roi_group.create_dataset('means', data=means, **h5_compression_options(means))
+                            roi_group.create_dataset('frames', data=frames, **h5_compression_options(frames))
                         
                         # Store timestamps as ISO strings
-                        timestamps = self._live_data[roi_name]['timestamps']
-                        if len(timestamps) > 0:
-                            ts_strings = [ts.isoformat() for ts in timestamps]
+                        timestamps = self._live_data[roi_name]['timestamps'][:length]
+                        if length > 0:
+                            ts_strings = list(np.datetime_as_string(timestamps, unit='us'))
                             dt = h5py.special_dtype(vlen=str)
                             roi_group.create_dataset('timestamps', data=ts_strings, dtype=dt)
                         
@@ -262,7 +321,7 @@ class ROIDataCache:
                             # Store ROI properties
                             for key, value in roi_dict.items():
                                 if isinstance(value, np.ndarray):
-                                    roi_subgroup.create_dataset(key, data=value)
+                                    roi_subgroup.create_dataset(key, data=value, **h5_compression_options(value))
                                 elif isinstance(value, str):
                                     roi_subgroup.attrs[key] = value
                                 elif isinstance(value, (int, float)):
@@ -291,10 +350,7 @@ class ROIDataCache:
             
             data = self._data[roi_name]
             
-            if frame_index not in data['computed_frames']:
-                return None
-            
-            if frame_index >= len(data['means']):
+            if frame_index >= len(data['means']) or not data['computed'][frame_index]:
                 return None
             
             return float(data['means'][frame_index])
@@ -312,15 +368,29 @@ class ROIDataCache:
             
             data = self._data[roi_name]
             
-            if len(data['computed_frames']) == 0:
+            if data['computed_count'] == 0:
                 return np.array([]), np.array([])
             
             # Get sorted frame indices
-            frames = np.array(sorted(data['computed_frames']), dtype=np.int32)
+            frames = np.flatnonzero(data['computed']).astype(np.int32)
             means = data['means'][frames]
             
             return frames, means
     
+    def missing_frames(self, roi_name):
+        """
+        Get the frames that still need computation for an ROI.
+        
+        Returns:
+            np.ndarray: sorted frame indices not computed yet
+        """
+        with self._lock:
+            if roi_name not in self._data:
+                return np.array([], dtype=np.intp)
+            
+            data = self._data[roi_name]
+            return np.flatnonzero(~data['computed'][:data['total_frames']])
+    
     def get_roi_ref(self, roi_name):
         """Get the ROI object reference."""
         with self._lock:
@@ -352,7 +422,7 @@ class ROIDataCache:
                 return 0, 0
             
             data = self._data[roi_name]
-            return len(data['computed_frames']), data['total_frames']
+            return data['computed_count'], data['total_frames']
     
     def is_fully_computed(self, roi_name):
         """Check if all frames have been computed for this ROI."""
@@ -361,7 +431,7 @@ class ROIDataCache:
                 return False
             
             data = self._data[roi_name]
-            return len(data['computed_frames']) >= data['total_frames']
+            return data['computed_count'] >= data['total_frames']
     
     def clear_all(self):
         """Clear all cached data."""
@@ -383,15 +453,13 @@ class ROIDataCache:
                 old_size = len(data['means'])
                 
                 if new_total_frames > old_size:
-                    # Expand array
-                    old_means = data['means']
-                    data['means'] = np.zeros(new_total_frames, dtype=np.float32)
-                    data['means'][:old_size] = old_means
+                    # Expand arrays
+                    self._grow(data, new_total_frames)
                 elif new_total_frames < old_size:
-                    # Shrink array
+                    # Shrink arrays, dropping computed frames that are out of range
                     data['means'] = data['means'][:new_total_frames]
-                    # Remove computed frames that are out of range
-                    data['computed_frames'] = {f for f in data['computed_frames'] if f < new_total_frames}
+                    data['computed'] = data['computed'][:new_total_frames]
+                    data['computed_count'] = int(np.count_nonzero(data['computed']))
                 
                 data['total_frames'] = new_total_frames
     
@@ -407,7 +475,9 @@ class ROIDataCache:
                 return
             
             # Clear computed frames - forces recomputation
-            self._data[roi_name]['computed_frames'].clear()
+            data = self._data[roi_name]
+            data['computed'].fill(False)
+            data['computed_count'] = 0
     
     def get_stats_summary(self):
         """
@@ -425,8 +495,8 @@ class ROIDataCache:
             for roi_name, data in self._data.items():
                 summary['rois'][roi_name] = {
                     'total_frames': data['total_frames'],
-                    'computed_frames': len(data['computed_frames']),
-                    'progress_percent': (len(data['computed_frames']) / data['total_frames'] * 100) 
+                    'computed_frames': data['computed_count'],
+                    'progress_percent': (data['computed_count'] / data['total_frames'] * 100) 
                                        if data['total_frames'] > 0 else 0
                 }
             
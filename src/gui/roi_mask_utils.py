@@ -2,16 +2,26 @@
 ROI Mask Utilities
 Static helper methods for computing mean intensity values for all ROI types.
 """
+import threading
+import weakref
 import numpy as np
 from silx.gui.plot.items.roi import (
     PointROI, CrossROI, LineROI, HorizontalLineROI, VerticalLineROI,
     RectangleROI, CircleROI, EllipseROI, PolygonROI, ArcROI
 )
 
+# Upper bound on the bytes read from the stack at once by compute_means_for_frames
+BLOCK_READ_BYTES = 64 * 1024 * 1024
+
 
 class ROIMaskUtils:
     """Static utility class for ROI mean calculations."""
     
+    # Masks of shape ROIs, reused while geometry and frame shape are unchanged:
+    # {roi: (geometry_key, frame_shape, region)} - see _get_mask_region
+    _mask_cache = weakref.WeakKeyDictionary()
+    _mask_cache_lock = threading.Lock()
+    
     @staticmethod
     def compute_mean_for_roi(roi, frame_data):
         """
@@ -55,6 +65,90 @@ class ROIMaskUtils:
             print(f"Error computing mean for ROI {roi.getName()}: {e}")
             return 0.0
     
+    @staticmethod
+    def compute_means_for_frames(roi, stack, start, stop, buffer=None):
+        """
+        Calculate mean intensity of an ROI for frames start..stop-1 of a stack.
+        
+        Shape ROIs read only their bounding box, a block of frames (whole HDF5
+        chunks for chunked datasets) at a time, and reduce each block with a
+        single numpy call. Other ROI types fall back to compute_mean_for_roi
+        per frame.
+        
+        Args:
+            roi: A silx ROI object
+            stack: 3D numpy array or h5py dataset with shape (N, H, W)
+            start: First frame index
+            stop: Frame index after the last one
+            buffer: Optional 1D array of the stack's dtype that h5py blocks are
+                read into; used when large enough, so callers can keep one
+                buffer across calls instead of allocating per call
+            
+        Returns:
+            np.ndarray: float64 mean per frame (length stop - start)
+        """
+        means = np.zeros(max(stop - start, 0), dtype=np.float64)
+        if len(means) == 0:
+            return means
+        
+        frame_shape = tuple(stack.shape[1:])
+        shape_roi = isinstance(roi, (RectangleROI, CircleROI, EllipseROI, PolygonROI, ArcROI))
+        local_index = None
+        if shape_roi:
+            bbox, flat_index, count = ROIMaskUtils._get_mask_region(roi, frame_shape)
+            if count == 0:
+                return means
+            rows, cols = bbox
+            box_width = cols.stop - cols.start
+            box_shape = (rows.stop - rows.start, box_width)
+            if flat_index is not None:
+                # Positions of the ROI pixels inside the bounding box
+                local_index = ((flat_index // frame_shape[1] - rows.start) * box_width
+                               + flat_index % frame_shape[1] - cols.start)
+        else:
+            rows, cols = slice(None), slice(None)
+            box_shape = frame_shape
+        
+        box_bytes = box_shape[0] * box_shape[1] * stack.dtype.itemsize
+        step = max(1, BLOCK_READ_BYTES // max(1, box_bytes))
+        # Blocks of whole HDF5 chunks, ending on chunk boundaries, so no chunk is
+        # read and decompressed for two blocks
+        chunks = getattr(stack, 'chunks', None)
+        frames_per_chunk = chunks[0] if chunks else 1
+        if frames_per_chunk > 1:
+            step = max(frames_per_chunk, step - step % frames_per_chunk)
+        # h5py datasets are read into one buffer reused by every block; numpy
+        # stacks are sliced as views
+        block_buffer = None
+        if hasattr(stack, 'read_direct'):
+            block_shape = (min(step, stop - start),) + tuple(box_shape)
+            size = block_shape[0] * block_shape[1] * block_shape[2]
+            if buffer is not None and buffer.dtype == stack.dtype and buffer.size >= size:
+                block_buffer = buffer[:size].reshape(block_shape)
+            else:
+                block_buffer = np.empty(block_shape, dtype=stack.dtype)
+        block_start = start
+        while block_start < stop:
+            block_stop = min((block_start // step + 1) * step, stop)
+            if block_buffer is not None:
+                block = block_buffer[:block_stop - block_start]
+                stack.read_direct(block, np.s_[block_start:block_stop, rows, cols])
+            else:
+                block = stack[block_start:block_stop, rows, cols]
+            out = means[block_start - start:block_stop - start]
+            try:
+                if not shape_roi:
+                    out[:] = [ROIMaskUtils.compute_mean_for_roi(roi, frame) for frame in block]
+                elif local_index is None:
+                    out[:] = block.sum(axis=(1, 2), dtype=np.float64) / count
+                else:
+                    values = np.take(block.reshape(len(block), -1), local_index, axis=1)
+                    out[:] = values.sum(axis=1, dtype=np.float64) / count
+            except Exception as e:
+                print(f"Error computing means for ROI {roi.getName()}: {e}")
+            block_start = block_stop
+        return means
+    
     @staticmethod
     def _compute_point_mean(roi, frame_data):
         """Compute mean for Point/Cross ROI (single pixel)."""
@@ -72,7 +166,7 @@ class ROIMaskUtils:
     
     @staticmethod
     def _compute_line_mean(roi, frame_data):
-        """Compute mean along a line ROI using Bresenham algorithm."""
+        """Compute mean along a line ROI over its Bresenham pixels."""
         endpoints = roi.getEndPoints()
         if endpoints is None or len(endpoints) != 2:
             return 0.0
@@ -81,27 +175,18 @@ class ROIMaskUtils:
         if start is None or end is None:
             return 0.0
         
-        # Get line coordinates using Bresenham
-        coords = ROIMaskUtils._bresenham_line(
+        xs, ys = ROIMaskUtils._line_pixels(
             int(start[0]), int(start[1]),
             int(end[0]), int(end[1])
         )
         
-        if len(coords) == 0:
-            return 0.0
-        
+        # Keep coordinates that are within bounds
         height, width = frame_data.shape
-        
-        # Filter coordinates that are within bounds
-        valid_coords = [(x, y) for x, y in coords 
-                       if 0 <= y < height and 0 <= x < width]
-        
-        if len(valid_coords) == 0:
+        valid = (xs >= 0) & (xs < width) & (ys >= 0) & (ys < height)
+        if not valid.any():
             return 0.0
         
-        # Extract values and compute mean
-        values = [frame_data[y, x] for x, y in valid_coords]
-        return float(np.mean(values))
+        return float(frame_data[ys[valid], xs[valid]].mean(dtype=np.float64))
     
     @staticmethod
     def _compute_horizontal_line_mean(roi, frame_data):
@@ -136,70 +221,163 @@ class ROIMaskUtils:
     @staticmethod
     def _compute_mask_mean(roi, frame_data):
         """Compute mean for shape ROIs using mask-based approach."""
-        height, width = frame_data.shape
-        
-        # Create coordinate grids
-        y_coords, x_coords = np.ogrid[0:height, 0:width]
-        
-        # Get mask from ROI
-        # For shape ROIs, we need to check each point
-        mask = np.zeros((height, width), dtype=bool)
+        bbox, flat_index, count = ROIMaskUtils._get_mask_region(roi, frame_data.shape)
         
-        if isinstance(roi, RectangleROI):
-            mask = ROIMaskUtils._create_rectangle_mask(roi, height, width)
-        elif isinstance(roi, CircleROI):
-            mask = ROIMaskUtils._create_circle_mask(roi, height, width)
-        elif isinstance(roi, EllipseROI):
-            mask = ROIMaskUtils._create_ellipse_mask(roi, height, width)
-        elif isinstance(roi, PolygonROI):
-            mask = ROIMaskUtils._create_polygon_mask(roi, height, width)
-        elif isinstance(roi, ArcROI):
-            mask = ROIMaskUtils._create_arc_mask(roi, height, width)
-        
-        # Compute mean over masked region
-        if mask.sum() == 0:
+        if count == 0:
             return 0.0
         
-        return float(np.mean(frame_data[mask]))
+        # A fully covered box (rectangles) is summed as a plain slice; other
+        # shapes gather just their own pixels by flat index
+        if flat_index is None:
+            return float(frame_data[bbox].sum(dtype=np.float64) / count)
+        values = np.take(frame_data.reshape(-1), flat_index)
+        return float(values.sum(dtype=np.float64) / count)
     
     @staticmethod
-    def _create_rectangle_mask(roi, height, width):
-        """Create binary mask for rectangle ROI."""
-        origin = roi.getOrigin()
-        size = roi.getSize()
+    def _get_mask_region(roi, frame_shape):
+        """
+        Return (bbox, flat_index, pixel_count) for a shape ROI.
         
-        if origin is None or size is None:
-            return np.zeros((height, width), dtype=bool)
+        bbox is a (row slice, column slice) pair bounding the ROI pixels and
+        flat_index the ROI's pixel positions in the flattened frame, or None
+        when every pixel in the box is inside the ROI. The mask is only rebuilt
+        when the ROI geometry or the frame shape changed since the last call.
+        """
+        key = ROIMaskUtils._geometry_key(roi)
+        with ROIMaskUtils._mask_cache_lock:
+            cached = ROIMaskUtils._mask_cache.get(roi)
+        if cached is not None and cached[0] == key and cached[1] == frame_shape:
+            return cached[2]
         
-        x0, y0 = origin
-        w, h = size
+        height, width = frame_shape
+        if isinstance(roi, RectangleROI):
+            # Rectangles are their own bounding box - no mask needed
+            region = ROIMaskUtils._rectangle_region(roi, height, width)
+        else:
+            mask = None
+            offset = None
+            if isinstance(roi, CircleROI):
+                mask, offset = ROIMaskUtils._create_circle_mask(roi, height, width)
+            elif isinstance(roi, EllipseROI):
+                mask = ROIMaskUtils._create_ellipse_mask(roi, height, width)
+            elif isinstance(roi, PolygonROI):
+                mask = ROIMaskUtils._create_polygon_mask(roi, height, width)
+            elif isinstance(roi, ArcROI):
+                mask = ROIMaskUtils._create_arc_mask(roi, height, width)
+            if mask is None:
+                mask = np.zeros(frame_shape, dtype=bool)
+            region = ROIMaskUtils._region_from_mask(mask, frame_shape, offset)
+        
+        if key is not None:
+            with ROIMaskUtils._mask_cache_lock:
+                ROIMaskUtils._mask_cache[roi] = (key, frame_shape, region)
+        return region
+    
+    @staticmethod
+    def _region_from_mask(mask, frame_shape, offset=None):
+        """
+        Return (bbox, flat_index, pixel_count) for a boolean mask.
         
-        # Create mask
-        y_coords, x_coords = np.ogrid[0:height, 0:width]
-        mask = ((x_coords >= x0) & (x_coords < x0 + w) &
-                (y_coords >= y0) & (y_coords < y0 + h))
+        The mask covers the whole frame (anything broadcastable to frame_shape,
+        e.g. ogrid results), or with offset=(row, col) only a box of the frame
+        whose top-left pixel is at that position.
+        """
+        if offset is None:
+            mask = np.broadcast_to(mask, frame_shape)
+            row0, col0 = 0, 0
+        else:
+            row0, col0 = offset
+        
+        rows = np.flatnonzero(mask.any(axis=1))
+        cols = np.flatnonzero(mask.any(axis=0))
+        if len(rows) == 0:
+            return (slice(0, 0), slice(0, 0)), None, 0
+        local = (slice(rows[0], rows[-1] + 1), slice(cols[0], cols[-1] + 1))
+        bbox = (slice(row0 + rows[0], row0 + rows[-1] + 1), slice(col0 + cols[0], col0 + cols[-1] + 1))
+        count = int(np.count_nonzero(mask[local]))
+        box_size = (rows[-1] + 1 - rows[0]) * (cols[-1] + 1 - cols[0])
+        if count == box_size:
+            return bbox, None, count
+        mask_rows, mask_cols = np.nonzero(mask)
+        flat_index = (mask_rows + row0) * frame_shape[1] + (mask_cols + col0)
+        return bbox, flat_index, count
+    
+    @staticmethod
+    def _geometry_key(roi):
+        """Return a hashable snapshot of a shape ROI's geometry, or None if unknown."""
+        try:
+            if isinstance(roi, RectangleROI):
+                return ('rect', tuple(roi.getOrigin()), tuple(roi.getSize()))
+            if isinstance(roi, CircleROI):
+                return ('circle', tuple(roi.getCenter()), roi.getRadius())
+            if isinstance(roi, EllipseROI):
+                orientation = roi.getOrientation() if hasattr(roi, 'getOrientation') else 0
+                return ('ellipse', tuple(roi.getCenter()), roi.getMajorRadius(),
+                        roi.getMinorRadius(), orientation)
+            if isinstance(roi, PolygonROI):
+                points = roi.getPoints()
+                return ('polygon', None if points is None else np.asarray(points).tobytes())
+            if isinstance(roi, ArcROI):
+                return ('arc', tuple(roi.getCenter()), roi.getInnerRadius(), roi.getOuterRadius())
+        except Exception:
+            pass
+        return None
+    
+    @staticmethod
+    def _rectangle_region(roi, height, width):
+        """
+        Return the mask region of a rectangle ROI without building a mask.
         
-        return mask
+        Covers the pixels with x0 <= x < x0 + w and y0 <= y < y0 + h,
+        clipped to the frame.
+        """
+        origin = roi.getOrigin()
+        size = roi.getSize()
+        if origin is not None and size is not None:
+            x0, y0 = origin
+            w, h = size
+            col_start = min(max(int(np.ceil(x0)), 0), width)
+            col_stop = min(max(int(np.ceil(x0 + w)), col_start), width)
+            row_start = min(max(int(np.ceil(y0)), 0), height)
+            row_stop = min(max(int(np.ceil(y0 + h)), row_start), height)
+            count = (row_stop - row_start) * (col_stop - col_start)
+            if count > 0:
+                return (slice(row_start, row_stop), slice(col_start, col_stop)), None, count
+        return (slice(0, 0), slice(0, 0)), None, 0
     
     @staticmethod
     def _create_circle_mask(roi, height, width):
-        """Create binary mask for circle ROI."""
+        """
+        Create binary mask for circle ROI over its bounding box only.
+        
+        Returns:
+            (mask, (row, col)): mask of the box and its top-left frame pixel,
+            or (None, None) if the ROI is invalid or outside the frame
+        """
         center = roi.getCenter()
         radius = roi.getRadius()
         
         if center is None or radius is None or radius <= 0:
-            return np.zeros((height, width), dtype=bool)
+            return None, None
         
         cx, cy = center
         
-        # Create coordinate grids
-        y_coords, x_coords = np.ogrid[0:height, 0:width]
+        # Only rows/columns within the radius can be inside the circle
+        row0 = max(int(np.ceil(cy - radius)), 0)
+        row1 = min(int(np.floor(cy + radius)) + 1, height)
+        col0 = max(int(np.ceil(cx - radius)), 0)
+        col1 = min(int(np.floor(cx + radius)) + 1, width)
+        if row0 >= row1 or col0 >= col1:
+            return None, None
+        
+        # Create coordinate grids for the box
+        y_coords, x_coords = np.ogrid[row0:row1, col0:col1]
         
         # Distance from center
         dist_sq = (x_coords - cx)**2 + (y_coords - cy)**2
         mask = dist_sq <= radius**2
         
-        return mask
+        return mask, (row0, col0)
     
     @staticmethod
     def _create_ellipse_mask(roi, height, width):
@@ -293,11 +471,38 @@ class ROIMaskUtils:
         except:
             return np.zeros((height, width), dtype=bool)
     
+    @staticmethod
+    def _line_pixels(x0, y0, x1, y1):
+        """
+        Return the pixels of _bresenham_line(x0, y0, x1, y1) as x and y index arrays.
+        
+        One pixel per step along the major axis; minor-axis offsets are rounded in
+        integer arithmetic, with ties towards the start point as in the Bresenham walk.
+        
+        Returns:
+            tuple of (xs, ys) np.intp arrays
+        """
+        dx = abs(x1 - x0)
+        dy = abs(y1 - y0)
+        n = max(dx, dy)
+        if n == 0:
+            return np.array([x0], dtype=np.intp), np.array([y0], dtype=np.intp)
+        
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        
+        k = np.arange(n + 1, dtype=np.intp)
+        xs = x0 + sx * ((2 * k * dx + n - 1) // (2 * n))
+        ys = y0 + sy * ((2 * k * dy + n - 1) // (2 * n))
+        return xs, ys
+    
     @staticmethod
     def _bresenham_line(x0, y0, x1, y1):
         """
         Generate coordinates along a line using Bresenham's algorithm.
         
+        Reference for _line_pixels, which computes the same pixels vectorized.
+        
         Returns:
             list of (x, y) tuples
         """
@@ -1,6 +1,7 @@
 from silx.gui import qt
 import numpy as np
 import json
+import contextlib
 import h5py
 from silx.io import dictdump
 from silx.gui.plot.items.roi import (
@@ -158,6 +159,45 @@ ROI_GROUP_NAME = "roi_metadata"
 ROI_DATASET_NAME = "roi_data"
 EMBED_FLAG_NAME = "embed_enabled"
 
+# Arrays up to this size are stored as attributes of the ROI group rather than
+# as separate datasets (attributes live in the object header, well under 64 KiB)
+ROI_ATTR_ARRAY_MAX_BYTES = 4096
+
+# Numeric datasets smaller than this are stored unfiltered
+H5_COMPRESS_MIN_BYTES = 4096
+
+
+@contextlib.contextmanager
+def _open_h5(h5_file, mode):
+    """
+    Yield an open HDF5 file: `h5_file` itself if it is an already open h5py.File
+    (left open afterwards), otherwise the file at that path opened with `mode`.
+    """
+    if isinstance(h5_file, h5py.File):
+        yield h5_file
+    else:
+        with h5py.File(h5_file, mode) as f:
+            yield f
+
+
+def h5_compression_options(data):
+    """
+    Return create_dataset keyword arguments suited to a numeric array.
+    
+    Small arrays are stored without filters (compressing a few hundred bytes
+    only costs CPU); larger ones use light gzip, with shuffle for multi-byte
+    types so float time series compress well. gzip rather than lzf keeps the
+    files readable by any HDF5 tool.
+    
+    :param data: Numpy array to be stored.
+    :return: Dict of keyword arguments for h5py create_dataset.
+    """
+    data = np.asarray(data)
+    if data.nbytes < H5_COMPRESS_MIN_BYTES or data.dtype.kind not in "biuf":
+        return {}
+    return {"compression": "gzip", "compression_opts": 1,
+            "shuffle": data.dtype.itemsize > 1}
+
 
 def save_rois_to_h5(rois, h5_file_path, embed_enabled=True):
     """
@@ -171,41 +211,41 @@ def save_rois_to_h5(rois, h5_file_path, embed_enabled=True):
           class = "RectangleROI"
           name = "ROI 1"
           color = "#00ff00"
-          origin = [x, y]
-          size = [w, h]
+          origin = [x, y]   (attribute; arrays above ROI_ATTR_ARRAY_MAX_BYTES
+          size = [w, h]      are stored as datasets instead)
         ROI_1/
           ...
     
     :param rois: List of ROI objects.
-    :param h5_file_path: Path to the HDF5 file.
+    :param h5_file_path: Path to the HDF5 file, or an h5py.File already open for writing.
     :param embed_enabled: Whether to save the embed checkbox state.
     :return: True if successful, False otherwise.
     """
     try:
-        with h5py.File(h5_file_path, "r+") as f:
+        with _open_h5(h5_file_path, "r+") as f:
             # Remove existing ROI metadata if present
             if ROI_GROUP_NAME in f:
                 del f[ROI_GROUP_NAME]
             
             # Create ROI metadata group
             roi_group = f.create_group(ROI_GROUP_NAME)
-            roi_group.attrs[EMBED_FLAG_NAME] = embed_enabled
-            roi_group.attrs["roi_count"] = len(rois)
+            roi_group.attrs.update({EMBED_FLAG_NAME: embed_enabled,
+                                    "roi_count": len(rois)})
             
             # Save each ROI as a subgroup
             for i, roi in enumerate(rois):
                 roi_dict = roi_to_dict(roi)
                 roi_subgroup = roi_group.create_group(f"ROI_{i}")
                 
-                # Store string values as attributes, arrays as datasets
+                # Store strings, scalars and small arrays as attributes in one go;
+                # only large arrays (long polygons) get their own dataset
+                attrs = {}
                 for key, value in roi_dict.items():
-                    if isinstance(value, str):
-                        roi_subgroup.attrs[key] = value
-                    elif isinstance(value, np.ndarray):
-                        roi_subgroup.create_dataset(key, data=value)
+                    if isinstance(value, np.ndarray) and value.nbytes > ROI_ATTR_ARRAY_MAX_BYTES:
+                        roi_subgroup.create_dataset(key, data=value, **h5_compression_options(value))
                     else:
-                        # Scalar values
-                        roi_subgroup.attrs[key] = value
+                        attrs[key] = value
+                roi_subgroup.attrs.update(attrs)
             
         return True
     except Exception as e:
@@ -221,12 +261,12 @@ def load_rois_from_h5(h5_file_path, plot=None):
     
     Reads the hierarchy created by save_rois_to_h5.
     
-    :param h5_file_path: Path to the HDF5 file.
+    :param h5_file_path: Path to the HDF5 file, or an already open h5py.File.
     :param plot: Unused (kept for backwards compatibility).
     :return: Tuple of (list of ROI objects, embed_enabled flag) or (None, False) if not found.
     """
     try:
-        with h5py.File(h5_file_path, "r") as f:
+        with _open_h5(h5_file_path, "r") as f:
             if ROI_GROUP_NAME not in f:
                 print(f"No ROI group '{ROI_GROUP_NAME}' found in {h5_file_path}")
                 return None, False
@@ -281,11 +321,11 @@ def h5_has_rois(h5_file_path):
     """
     Check if an HDF5 file contains saved ROIs.
     
-    :param h5_file_path: Path to the HDF5 file.
+    :param h5_file_path: Path to the HDF5 file, or an already open h5py.File.
     :return: True if ROIs are present, False otherwise.
     """
     try:
-        with h5py.File(h5_file_path, "r") as f:
+        with _open_h5(h5_file_path, "r") as f:
             if ROI_GROUP_NAME not in f:
                 return False
             roi_group = f[ROI_GROUP_NAME]
@@ -86,11 +86,12 @@ class roiStatsWindow(qt.QWidget):
         self.timeseriesButton.clicked.connect(self.showTimeseries)
         self.addAllButton.clicked.connect(self.addAllRois)
         
-        # Connect computation engine signals
-        self.computation_engine.currentFrameReady.connect(self._on_current_frame_ready)
-        self.computation_engine.bulkProgressUpdated.connect(self._on_bulk_progress)
-        self.computation_engine.bulkAnalysisComplete.connect(self._on_bulk_complete)
-        self.computation_engine.errorOccurred.connect(self._on_computation_error)
+        # Connect computation engine signals (emitted from worker threads, so always queued)
+        queued = qt.Qt.ConnectionType.QueuedConnection
+        self.computation_engine.currentFrameReady.connect(self._on_current_frame_ready, queued)
+        self.computation_engine.bulkProgressUpdated.connect(self._on_bulk_progress, queued)
+        self.computation_engine.bulkAnalysisComplete.connect(self._on_bulk_complete, queued)
+        self.computation_engine.errorOccurred.connect(self._on_computation_error, queued)
         
         # Start computation engine
         self.computation_engine.start()
@@ -260,6 +261,22 @@ class roiStatsWindow(qt.QWidget):
             if roi is not None:
                 self.computation_engine.queue_bulk_analysis(roi_name, roi, self._total_frames)
     
+    def resizeDataset(self):
+        """
+        Pick up a size change of the current dataset (e.g. a growing recording).
+        
+        Unlike setDataset this keeps the computed values and does not re-queue
+        bulk analysis; only the per-ROI arrays are resized.
+        """
+        if self._dataset is None or self._dataset.ndim != 3:
+            return
+        total_frames = self._dataset.shape[0]
+        if total_frames == self._total_frames:
+            return
+        self._total_frames = total_frames
+        self.computation_engine.set_dataset(self._dataset)
+        self.data_cache.resize_dataset(total_frames)
+    
     def updateCurrentFrame(self, frame_index, frame_data=None):
         """
         Update statistics for the current frame.
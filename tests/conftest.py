@@ -0,0 +1,5 @@
+import os
+import sys
+
+# The application modules are imported as top-level packages from src/ (e.g. `gui.roi_mask_utils`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
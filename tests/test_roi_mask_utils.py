@@ -0,0 +1,26 @@
+import itertools
+import random
+
+import pytest
+
+pytest.importorskip("silx")
+
+from gui.roi_mask_utils import ROIMaskUtils
+
+
+def _pixels(x0, y0, x1, y1):
+    xs, ys = ROIMaskUtils._line_pixels(x0, y0, x1, y1)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def test_line_pixels_match_bresenham_for_all_short_lines():
+    coords = range(-6, 7)
+    for x0, y0, x1, y1 in itertools.product(coords, coords, coords, coords):
+        assert _pixels(x0, y0, x1, y1) == ROIMaskUtils._bresenham_line(x0, y0, x1, y1)
+
+
+def test_line_pixels_match_bresenham_for_long_lines():
+    rng = random.Random(0)
+    for _ in range(2000):
+        x0, y0, x1, y1 = (rng.randint(-500, 500) for _ in range(4))
+        assert _pixels(x0, y0, x1, y1) == ROIMaskUtils._bresenham_line(x0, y0, x1, y1)